@@ -0,0 +1,58 @@
+"""
+GitHub Auto PR Creator.
+
+Run it with `python -m auto_create_prs [options]` (or the auto-create-prs.py
+launcher). Importing the package is cheap and touches no files, so other
+tools can reuse the pipeline:
+
+    from auto_create_prs import process_link, get_pr_title
+    row = process_link("https://github.com/org/repo/compare/main...feature", get_pr_title())
+    row.status, row.pr_link  # ResultRow
+
+Configuration (token, input paths, concurrency) lives in
+auto_create_prs/config.py. The modules, from the request layer up:
+
+    config        settings, read at call time as config.NAME
+    run_log       JSON-lines run log
+    session       HTTP sessions and connection statistics
+    run_metrics   timing histograms and counters
+    retry         retry policy and budget
+    tokens        token pool
+    ratelimit     rate-limit scheduler
+    api           github_request() / github_request_async()
+    cache         ETag cache and cached_get()
+    links         loading, parsing and planning compare links
+    results       result rows and Excel workbooks
+    pulls         open-PR index and PR creation
+    compare       compare data
+    engines       pipeline stages and the threaded / asyncio engines
+    journal       resumable result journal
+    shards        sharded execution across worker processes
+    history       run history
+    precheck      pre-check PR triage
+    preflight     GraphQL pre-flight
+    cli           argument parsing, batch / watch modes and main()
+"""
+
+from .cli import main, parse_args, prepare_output_dir
+from .engines import process_all_links, process_all_links_async, process_link
+from .links import get_pr_title, load_compare_links, parse_compare_link, plan_links
+from .results import FILES_TRUNCATED, ResultRow, ResultStatus, save_results_to_excel, summarize_by_repo
+
+__all__ = [
+    "FILES_TRUNCATED",
+    "ResultRow",
+    "ResultStatus",
+    "get_pr_title",
+    "load_compare_links",
+    "main",
+    "parse_args",
+    "parse_compare_link",
+    "plan_links",
+    "prepare_output_dir",
+    "process_all_links",
+    "process_all_links_async",
+    "process_link",
+    "save_results_to_excel",
+    "summarize_by_repo",
+]
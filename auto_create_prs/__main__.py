@@ -0,0 +1,5 @@
+"""Entry point for `python -m auto_create_prs`."""
+
+from .cli import main
+
+main()
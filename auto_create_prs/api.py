@@ -0,0 +1,217 @@
+"""Send GitHub API requests through the token pool, rate-limit scheduler and retry policy."""
+
+import asyncio
+import time
+import logging
+
+from .ratelimit import MAX_RATE_LIMIT_PARKS, rate_limiter
+from .retry import RETRY_STATUSES, retry_policy
+from .run_metrics import endpoint_name, metrics
+from .session import REQUEST_TIMEOUT, count_request, load_aiohttp
+from .tokens import token_pool
+
+
+# --------------------- GitHub Requests ------------------------
+# Bytes read from the compare response at a time in light mode
+COMPARE_CHUNK_SIZE = 64 * 1024
+
+
+class RequestAttempts:
+    """
+    Retry, park and resend decisions for one API call, shared by
+    github_request() and github_request_async() so both engines treat every
+    status the same way. The engines only send, sleep and read bodies.
+    """
+
+    def __init__(self, method, url, retry):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_name(method, url)
+        self.retry = (method == "GET") if retry is None else retry
+        self.attempt = 0
+        self.parks = 0
+        self.start = 0.0
+
+    def begin(self, wait_start):
+        """Book a send the rate limiter has admitted; return the token to use."""
+        self.start = time.perf_counter()
+        metrics.observe("queue_wait_rate_limiter", self.start - wait_start)
+        retry_policy.record_request()
+        return token_pool.acquire()
+
+    def aborted(self, token):
+        """Hand the token and rate-limit slot back after an interrupted send."""
+        token_pool.release(token, 0, {})
+        rate_limiter.release(0, {})
+
+    def failed(self, token, error):
+        """
+        Book a send that raised before any response arrived.
+
+        Returns:
+            float|None: Seconds to wait before sending again, or None to re-raise.
+        """
+        self.aborted(token)
+        metrics.observe_request(self.endpoint, "exception", time.perf_counter() - self.start)
+        if not (self.retry and retry_policy.should_retry(self.attempt)):
+            return None
+        delay = retry_policy.backoff(self.attempt)
+        logging.warning(f"{self.method} {self.url} failed ({error!r}); retry {self.attempt + 1} in {delay:.1f}s")
+        metrics.count("retries")
+        self.attempt += 1
+        return delay
+
+    def replied(self, token, status, headers, secondary=False):
+        """
+        Book a response.
+
+        Args:
+            secondary (bool): The body reports a secondary rate limit.
+
+        Returns:
+            float|None: Seconds to wait before sending again (0 to resend at
+            once), or None when the response is the one to return.
+        """
+        metrics.observe_request(self.endpoint, status, time.perf_counter() - self.start)
+
+        # ---- Token revoked or out of budget: resend with another token
+        if token_pool.release(token, status, headers):
+            rate_limiter.release(0, {})
+            return 0
+
+        # ---- Rate limited: park until the reset, then send again
+        if rate_limiter.release(status, headers, secondary):
+            self.parks += 1
+            if self.parks > MAX_RATE_LIMIT_PARKS:
+                return None
+            metrics.count("rate_limit_parks")
+            logging.info(f"Parked rate-limited request: {self.method} {self.url}")
+            return 0
+
+        # ---- Transient server error: back off and retry
+        if self.retry and status in RETRY_STATUSES and retry_policy.should_retry(self.attempt):
+            delay = retry_policy.backoff(self.attempt, headers.get("Retry-After"))
+            logging.warning(f"{self.method} {self.url} returned {status}; retry {self.attempt + 1} in {delay:.1f}s")
+            metrics.count("retries")
+            self.attempt += 1
+            return delay
+
+        return None
+
+
+def github_request(session, method, url, retry=None, **kwargs):
+    """
+    Send a GitHub API request through the rate-limit scheduler and retry policy.
+
+    Requests that hit a primary or secondary rate limit are parked until the
+    limit resets and then sent again, up to MAX_RATE_LIMIT_PARKS times.
+    Connection errors and 5xx responses are retried with retry_policy's
+    exponential backoff (full jitter, Retry-After honoured) while the run's
+    retry budget lasts.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        method (str): HTTP method, e.g. "GET" or "POST".
+        url (str): Full API URL.
+        retry (bool|None): Retry transient failures; defaults to True for GET only,
+            since repeating other methods may not be safe.
+        **kwargs: Passed through to session.request().
+
+    Returns:
+        requests.Response: The last response received.
+
+    Raises:
+        requests.RequestException: If the last attempt failed without a response.
+    """
+    from requests.exceptions import RequestException
+
+    attempts = RequestAttempts(method, url, retry)
+    headers = dict(kwargs.pop("headers", None) or {})
+    kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+
+    while True:
+        wait_start = time.perf_counter()
+        rate_limiter.acquire()
+        token = attempts.begin(wait_start)
+        headers["Authorization"] = f"token {token}"
+        count_request()
+        try:
+            response = session.request(method, url, headers=headers, **kwargs)
+        except RequestException as e:
+            delay = attempts.failed(token, e)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        except BaseException:
+            attempts.aborted(token)
+            raise
+
+        secondary = response.status_code == 403 and "secondary rate limit" in response.text.lower()
+        delay = attempts.replied(token, response.status_code, response.headers, secondary)
+        if delay is None:
+            return response
+        response.close()
+        if delay:
+            time.sleep(delay)
+
+
+async def github_request_async(session, method, url, scanner=None, retry=None, **kwargs):
+    """
+    Asyncio counterpart of github_request() for an aiohttp session.
+
+    Args:
+        scanner (CompareScanner|None): If given, a 200 body is streamed into
+            it instead of being decoded, and payload is None. The scanner is
+            reset before each attempt streams into it.
+        retry (bool|None): Retry transient failures; defaults to True for GET only.
+
+    Returns:
+        tuple: (status, payload, headers) where payload is the decoded JSON
+        body, or None when the body is empty or not JSON, was streamed to the
+        scanner, or the response is 304 Not Modified or a transient 5xx.
+    """
+    aiohttp = load_aiohttp()
+    attempts = RequestAttempts(method, url, retry)
+    request_headers = dict(kwargs.pop("headers", None) or {})
+
+    while True:
+        wait_start = time.perf_counter()
+        await rate_limiter.acquire_async()
+        token = attempts.begin(wait_start)
+        request_headers["Authorization"] = f"token {token}"
+        try:
+            async with session.request(method, url, headers=request_headers, **kwargs) as response:
+                status = response.status
+                headers = response.headers
+                # 5xx bodies are often HTML error pages; callers only need the status
+                if status == 304 or status in RETRY_STATUSES:
+                    payload = None
+                elif scanner is not None and status == 200:
+                    payload = None
+                    scanner.reset()  # A dropped earlier attempt may have fed part of its body
+                    async for chunk in response.content.iter_chunked(COMPARE_CHUNK_SIZE):
+                        scanner.feed(chunk)
+                    scanner.close()
+                else:
+                    try:
+                        payload = await response.json(content_type=None)
+                    except ValueError:
+                        payload = None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            delay = attempts.failed(token, e)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            attempts.aborted(token)
+            raise
+
+        message = payload.get("message", "") if isinstance(payload, dict) else ""
+        secondary = status == 403 and "secondary rate limit" in message.lower()
+        delay = attempts.replied(token, status, headers, secondary)
+        if delay is None:
+            return status, payload, headers
+        if delay:
+            await asyncio.sleep(delay)
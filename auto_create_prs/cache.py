@@ -0,0 +1,233 @@
+"""On-disk cache of GitHub GET responses, revalidated with ETag/Last-Modified."""
+
+import os
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from . import config
+from .api import github_request, github_request_async
+from .run_metrics import metrics
+
+
+# --------------------- Conditional-Request Cache --------------
+# On-disk cache of GitHub GET responses, revalidated with ETag/Last-Modified;
+# kept in this sub-directory of config.BASE_OUTPUT_DIR
+HTTP_CACHE_DIRNAME = "http_cache"
+HTTP_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+
+class HTTPCache:
+    """
+    Size-bounded, least-recently-used on-disk cache for conditional GETs.
+
+    Each entry stores the validators (ETag / Last-Modified) of a 200 response
+    together with the value extracted from its body. Re-requests send
+    If-None-Match / If-Modified-Since, and a 304 reply is served from the
+    cache; GitHub does not count 304s against the rate limit.
+
+    Entries are one JSON file each; file modification time is the LRU clock.
+    A directory of None is resolved to config.BASE_OUTPUT_DIR/http_cache on
+    first use, so the output directory can still be changed at runtime.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = None  # OrderedDict key → size, oldest first; loaded lazily
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Scan the cache directory once (caller holds the lock)."""
+        if self._entries is not None:
+            return
+        if self.directory is None:
+            self.directory = os.path.join(config.BASE_OUTPUT_DIR, HTTP_CACHE_DIRNAME)
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(files))
+        self._total = sum(self._entries.values())
+
+    @staticmethod
+    def key(url, params=None):
+        """Return the cache key for a GET of url with query params."""
+        query = json.dumps(sorted((params or {}).items()), default=str)
+        return hashlib.sha256(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        """Return the cached entry dict for key, or None."""
+        with self._lock:
+            self._load()
+            if key not in self._entries:
+                return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def validators(self, entry):
+        """Build conditional request headers for a cached entry."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, key):
+        """Count a 304 served from the cache and mark the entry as recently used."""
+        with self._lock:
+            self.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def miss(self):
+        """Count a GET that had to download a full body."""
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key, headers, value):
+        """
+        Save a 200 response's validators and extracted value, evicting old entries.
+
+        Args:
+            key (str): Cache key from HTTPCache.key().
+            headers (Mapping): Response headers.
+            value: JSON-serializable value extracted from the body.
+        """
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        data = json.dumps({"etag": etag, "last_modified": last_modified, "value": value})
+        with self._lock:
+            self._load()
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique across worker processes
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logging.warning(f"HTTP cache write failed: {e}")
+                return
+
+            self._total += len(data) - self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+
+            # ---- Evict least recently used entries beyond the size bound
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                old_key, size = self._entries.popitem(last=False)
+                self._total -= size
+                self.evictions += 1
+                try:
+                    os.remove(self._path(old_key))
+                except OSError:
+                    pass
+
+
+# Shared by every request in the process
+http_cache = HTTPCache(None, HTTP_CACHE_MAX_BYTES)
+
+
+def cache_lookup(url, params):
+    """
+    Start a conditional GET for cached_get() and cached_get_async().
+
+    Returns:
+        tuple: (key, entry, headers) where headers carry the entry's validators.
+    """
+    key = HTTPCache.key(url, params)
+    entry = http_cache.get(key)
+    return key, entry, http_cache.validators(entry)
+
+
+def cache_reply(key, entry, status, headers, extract):
+    """
+    Finish a conditional GET for cached_get() and cached_get_async().
+
+    Args:
+        extract (callable): Called with no arguments to build the value of a
+            non-304 response; a 200's value is stored under key.
+
+    Returns:
+        tuple: (status, value); a 304 is reported as 200 with the cached value.
+    """
+    if status == 304 and entry is not None:
+        http_cache.hit(key)
+        metrics.count("http_cache_hits")
+        return 200, entry["value"]
+
+    http_cache.miss()
+    metrics.count("http_cache_misses")
+    value = extract()
+    if status == 200:
+        http_cache.store(key, headers, value)
+    return status, value
+
+
+def cached_get(session, url, extract, params=None, **kwargs):
+    """
+    Send a conditional GET through github_request(), backed by http_cache.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        url (str): Full API URL.
+        extract (callable): Turns a non-304 response into the value to return;
+            for 200 responses the value is also cached.
+        params (dict|None): Query parameters.
+        **kwargs: Passed through to session.request().
+
+    Returns:
+        tuple: (status_code, value); a 304 is reported as 200 with the cached value.
+    """
+    if not config.HTTP_CACHE_ENABLED:
+        response = github_request(session, "GET", url, params=params, **kwargs)
+        return response.status_code, extract(response)
+
+    key, entry, headers = cache_lookup(url, params)
+    response = github_request(session, "GET", url, params=params, headers=headers, **kwargs)
+    if response.status_code == 304 and entry is not None:
+        response.close()
+    return cache_reply(key, entry, response.status_code, response.headers, lambda: extract(response))
+
+
+async def cached_get_async(session, url, extract, params=None, scanner=None):
+    """
+    Asyncio counterpart of cached_get().
+
+    Args:
+        extract (callable): Called as extract(status, payload) for non-304 responses.
+        scanner (CompareScanner|None): Passed to github_request_async().
+
+    Returns:
+        tuple: (status, value); a 304 is reported as 200 with the cached value.
+    """
+    if not config.HTTP_CACHE_ENABLED:
+        status, payload, _ = await github_request_async(session, "GET", url, scanner=scanner, params=params)
+        return status, extract(status, payload)
+
+    key, entry, headers = cache_lookup(url, params)
+    status, payload, response_headers = await github_request_async(
+        session, "GET", url, scanner=scanner, params=params, headers=headers
+    )
+    return cache_reply(key, entry, status, response_headers, lambda: extract(status, payload))
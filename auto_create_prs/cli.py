@@ -0,0 +1,727 @@
+"""Command-line interface: argument parsing, run directories, batch and watch modes and main()."""
+
+import os
+import json
+import argparse
+import time
+import glob
+import logging
+from datetime import datetime
+
+from . import config
+from .cache import http_cache
+from .engines import ASYNC_CONCURRENCY, process_all_links, process_all_links_async
+from .history import (
+    HISTORY_FILENAME,
+    HISTORY_GROUPS,
+    history_day,
+    record_run_history,
+    run_history_command,
+    skip_created_today,
+)
+from .journal import RESUME_DONE_STATUSES, ResultJournal, load_journal
+from .links import get_pr_title, load_compare_links, plan_links
+from .precheck import open_links_from_excel, open_pr_links_in_browser
+from .preflight import preflight_links
+from .pulls import pr_index
+from .ratelimit import rate_limiter
+from .results import ResultStatus, api_calls_saved, new_stats, save_results_to_excel, write_results_workbook
+from .retry import retry_policy
+from .run_log import buffer_run_logging, configure_run_logging
+from .run_metrics import metrics, write_run_metrics
+from .session import get_connection_stats
+from .shards import process_all_links_sharded, run_shard_worker
+from .tokens import token_pool
+
+
+# -------------- Save Results and Summarize --------------------
+def usage_snapshot():
+    """
+    Read the process-wide request counters: connections, HTTP cache and rate-limit parks.
+
+    The connection pool, HTTP cache and rate limiter outlive a single input
+    file in batch and watch mode, so per-file figures are the difference of
+    two snapshots (usage_since()).
+
+    Returns:
+        dict: Counter name → value.
+    """
+    return {
+        **get_connection_stats(),
+        "cache_hits": http_cache.hits,
+        "cache_misses": http_cache.misses,
+        "cache_evictions": http_cache.evictions,
+        "rate_limit_parks": rate_limiter.parked,
+    }
+
+def usage_since(before):
+    """Return how much each usage_snapshot() counter grew since the snapshot before."""
+    return {name: value - before[name] for name, value in usage_snapshot().items()}
+
+def summarize_and_save_results(results, stats, output_dir, timestamp, interactive=True, usage=None):
+    """
+    Summarize the pull request creation results, export them to an Excel file,
+    and optionally open successful PR links in the browser.
+
+    Args:
+        results (list): List of individual PR processing results.
+        stats (dict): Aggregated status counts (e.g., Created, Skipped, Error).
+        output_dir (str): Directory where the Excel file will be saved.
+        timestamp (str): Timestamp string used to name the output file.
+        interactive (bool): Open the Excel file and prompt to open PR links; off in batch mode.
+        usage (dict|None): Counters of this file from usage_since(); defaults
+            to the totals of the process.
+
+    Returns:
+        str: Path of the saved Excel file.
+    """
+    # Print and log summary statistics
+    print(f"\n📊 Summary: {stats['Created']} Created, {stats['Skipped']} Skipped, "
+          f"{stats['Duplicate']} Duplicate, {stats['Error']} Error")
+    logging.info(f"Summary: {stats}")
+
+    if usage is None:
+        usage = usage_snapshot()
+
+    # Report connection reuse across the shared session pool
+    print(f"🔌 Connections: {usage['connections_opened']} opened for "
+          f"{usage['requests_sent']} requests sent")
+    logging.info(f"Connections: opened={usage['connections_opened']} requests={usage['requests_sent']}")
+
+    # Report conditional-request cache effectiveness
+    if config.HTTP_CACHE_ENABLED:
+        print(f"🗄️ HTTP cache: {usage['cache_hits']} hits (304), {usage['cache_misses']} misses, "
+              f"{usage['cache_evictions']} evicted")
+        logging.info(f"HTTP cache: hits={usage['cache_hits']} misses={usage['cache_misses']} "
+                     f"evictions={usage['cache_evictions']}")
+
+    # Report how requests were spread over the token pool
+    token_usage = token_pool.usage()
+    if len(token_usage) > 1 or token_pool.revoked:
+        usage = ", ".join(f"{token}: {count}" for token, count in token_usage.items())
+        print(f"🔑 Tokens: {usage}" + (f" (revoked: {', '.join(token_pool.revoked)})" if token_pool.revoked else ""))
+        logging.info(f"Token usage: {token_usage} revoked={token_pool.revoked}")
+
+    # Report requests that were parked on a GitHub rate limit and requeued
+    if usage["rate_limit_parks"]:
+        print(f"⏳ Rate limit: {usage['rate_limit_parks']} requests parked and requeued")
+        logging.info(f"Rate-limited requests parked: {usage['rate_limit_parks']}")
+
+    # Compose Excel file path using timestamp and save all results
+    output_file = os.path.join(output_dir, f"pr_creation_results_{timestamp}.xlsx")
+    with metrics.stage("excel_save"):
+        output_file = save_results_to_excel(results, output_file, open_file=interactive)
+
+    # Ask user whether to open all successfully created PR links in browser
+    if interactive:
+        with metrics.stage("browser_open"):
+            open_pr_links_in_browser(results)
+    else:
+        print(f"💾 Results saved to: {output_file}")
+
+    return output_file
+
+# -------------- Command-line Arguments ------------------------
+def parse_args(argv=None):
+    """
+    Parse command-line options.
+
+    Args:
+        argv (list[str]|None): Arguments to parse; defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: Parsed options (inputs, watch, engine, compare_mode, preflight, no_probe, no_cache, resume,
+        prometheus, concurrency, shards, shard_worker, create_workers, skip_created_today) and the
+        run-history query options (history, history_import, link, repo, status, since, until, group_by, limit).
+    """
+    parser = argparse.ArgumentParser(description="Create GitHub pull requests from compare links in Excel.")
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        metavar="INPUT",
+        help="Input .xlsx/.csv files or glob patterns. When given, runs headless in batch mode "
+             "(no prompts, no browser) instead of processing INPUT_PATH.",
+    )
+    parser.add_argument(
+        "--watch",
+        metavar="DIR",
+        help="Keep running and process every new or changed .xlsx/.csv file dropped into DIR.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["threads", "asyncio"],
+        default="threads",
+        help="Execution engine: 'threads' (ThreadPoolExecutor) or 'asyncio' (aiohttp).",
+    )
+    parser.add_argument(
+        "--compare-mode",
+        choices=["light", "full"],
+        default=config.COMPARE_MODE,
+        help="'light' streams compare responses without keeping file patches; 'full' loads the whole JSON.",
+    )
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Resolve Skipped/Duplicate links in bulk via GraphQL before creating PRs.",
+    )
+    parser.add_argument(
+        "--no-probe",
+        action="store_true",
+        help="Open every pre-check link in Edge instead of triaging them through the API first.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the on-disk ETag cache for GitHub GET requests.",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_DIR",
+        help="Continue an earlier run directory: skip links already Created/Skipped/Duplicate in its journal. "
+             "In batch mode, pass the batch directory.",
+    )
+    parser.add_argument(
+        "--prometheus",
+        action="store_true",
+        help="Also write metrics in Prometheus text format (metrics.prom) next to metrics.json.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ASYNC_CONCURRENCY,
+        help=f"Compare checks in flight for the asyncio engine (default: {ASYNC_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Process links in N worker processes sharing a SQLite work queue, sharded by repository.",
+    )
+    parser.add_argument(
+        "--shard-worker",
+        metavar="QUEUE",
+        help="Run as a shard worker on an existing shard_queue.sqlite3 (e.g. from another host).",
+    )
+    parser.add_argument(
+        "--create-workers",
+        type=int,
+        default=config.CREATE_WORKERS,
+        help=f"PR creations in flight, for either engine (default: {config.CREATE_WORKERS}).",
+    )
+    parser.add_argument(
+        "--skip-created-today",
+        action="store_true",
+        help="Skip links whose PR the run history shows was created earlier today, without any API call.",
+    )
+
+    history = parser.add_argument_group(
+        "run history", f"Query {HISTORY_FILENAME} under the output directory instead of creating PRs."
+    )
+    history.add_argument("--history", action="store_true", help="Print matching results from earlier runs and exit.")
+    history.add_argument(
+        "--history-import",
+        action="store_true",
+        help="Add earlier run directories (from their results journals) to the run history and exit.",
+    )
+    history.add_argument("--link", help="Only this compare link.")
+    history.add_argument("--repo", metavar="ORG[/REPO]", help="Only this organization or repository.")
+    history.add_argument(
+        "--status", type=str.capitalize, choices=[status.value for status in ResultStatus], help="Only this result."
+    )
+    history.add_argument("--since", type=history_day, metavar="YYYY-MM-DD", help="Only runs on or after this day.")
+    history.add_argument("--until", type=history_day, metavar="YYYY-MM-DD", help="Only runs on or before this day.")
+    history.add_argument("--group-by", choices=list(HISTORY_GROUPS), help="Print totals per repo, status, day or run.")
+    history.add_argument("--limit", type=int, default=50, help="Maximum rows or groups to print (default: 50).")
+    return parser.parse_args(argv)
+
+# -------------- Confirm and Prepare Output --------------------
+# Prepare output directory, initialize logging, and confirm whether to proceed
+def confirm_run_and_prepare_output(resume_dir=None):
+    """
+    Prompt user for confirmation before proceeding with PR creation.
+    If confirmed, prepare a timestamped output directory and configure logging.
+
+    Args:
+        resume_dir (str|None): Existing run directory to continue instead of creating a new one.
+
+    Returns:
+        confirmed (bool): True if user confirms to proceed, False otherwise.
+        output_dir (str|None): Directory path to save results and logs.
+        timestamp (str|None): Timestamp string used for naming output files.
+    """
+    # Show user the file to be processed and ask for confirmation
+    print(f"\n📄 File to process: {config.INPUT_PATH}")
+    if resume_dir:
+        print(f"🔁 Resuming run: {resume_dir}")
+    if input("⚠️ Confirm to start PR creation for this file? (y/n): ").strip().lower() != "y":
+        print("❌ Cancelled by user.")
+        return False, None, None
+
+    output_dir, timestamp = prepare_output_dir(resume_dir)
+    if output_dir is None:
+        return False, None, None
+    return True, output_dir, timestamp
+
+def prepare_output_dir(resume_dir=None, name=None):
+    """
+    Create (or reuse, when resuming) the run directory and configure logging into it.
+
+    This is where a run's filesystem state begins; nothing is created at import.
+
+    Args:
+        resume_dir (str|None): Existing run directory to continue instead of creating a new one.
+        name (str|None): Appended to the directory name (run_{timestamp}_{name}) so runs
+            started in the same second do not collide.
+
+    Returns:
+        output_dir (str|None): Run directory, or None if resume_dir does not exist.
+        timestamp (str|None): Timestamp string used for naming output files.
+    """
+    if resume_dir:
+        # Reuse the earlier run's directory and timestamp (run_{timestamp})
+        output_dir = resume_dir
+        timestamp = os.path.basename(os.path.normpath(resume_dir)).replace("run_", "", 1)
+        if not os.path.isdir(output_dir):
+            print(f"❌ Run directory not found: {output_dir}")
+            return None, None
+    else:
+        # Generate a unique timestamp and output path for this run
+        now = datetime.now()
+        date_str = now.strftime("%Y%m%d")  # e.g. 20250609
+        timestamp = now.strftime("%Y%m%d_%H%M%S")  # e.g. 20250609_103045
+        run_name = f"run_{timestamp}_{name}" if name else f"run_{timestamp}"
+        output_dir = os.path.join(config.BASE_OUTPUT_DIR, date_str, run_name)
+        os.makedirs(output_dir, exist_ok=True)
+
+    # Log to a timestamped file inside the output directory
+    configure_run_logging(os.path.join(output_dir, f"log_{timestamp}.jsonl"))
+
+    return output_dir, timestamp
+
+# -------------- Batch Mode ------------------------------------
+INPUT_EXTENSIONS = (".xlsx", ".csv")
+
+BATCH_SUMMARY_HEADERS = ["Input File", "Links", "Created", "Skipped", "Duplicate", "Error", "Seconds", "Result File"]
+
+
+def expand_input_paths(patterns):
+    """
+    Expand input files and glob patterns (shells on Windows do not expand them).
+
+    Args:
+        patterns (list[str]): File paths or glob patterns.
+
+    Returns:
+        list[str]: Existing .xlsx/.csv files, in argument order, without duplicates.
+    """
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"⚠️ No files match: {pattern}")
+        for path in matches:
+            if not os.path.isfile(path):
+                print(f"⚠️ Not a file, skipped: {path}")
+            elif not path.lower().endswith(INPUT_EXTENSIONS):
+                print(f"⚠️ Not an .xlsx/.csv file, skipped: {path}")
+            elif os.path.abspath(path) not in (os.path.abspath(p) for p in paths):
+                paths.append(path)
+    return paths
+
+
+def input_output_dirs(batch_dir, paths):
+    """Map each input file to its own sub-directory of the batch run, named after the file."""
+    dirs, used = {}, set()
+    for path in paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        name, n = stem, 2
+        while name.lower() in used:
+            name, n = f"{stem}_{n}", n + 1
+        used.add(name.lower())
+        dirs[path] = os.path.join(batch_dir, name)
+    return dirs
+
+# -------------- Watch Mode ------------------------------------
+# Seconds between directory scans
+WATCH_POLL_SECONDS = 2.0
+
+# A file must keep the same size and mtime for this long before it is processed
+WATCH_SETTLE_SECONDS = 5.0
+
+# Remembers which file versions were already processed, across restarts
+WATCH_STATE_FILENAME = "watch_state.json"
+
+
+class DirectoryWatcher:
+    """
+    Poll a directory for new or changed compare-link files.
+
+    Uses os.scandir() polling rather than OS notifications so it behaves the
+    same on Windows, network shares and synced folders. A file is reported
+    once its (size, mtime) signature has been stable for settle_seconds and
+    it can be opened, which skips half-copied files and workbooks Excel is
+    still saving. Processed signatures are kept in a small JSON state file,
+    so a restart does not republish files that were already handled.
+    """
+
+    def __init__(self, directory, state_path, settle_seconds=WATCH_SETTLE_SECONDS):
+        self.directory = directory
+        self.state_path = state_path
+        self.settle_seconds = settle_seconds
+        self._pending = {}  # path → (signature, first seen with this signature)
+        self._done = {}  # path → signature last processed
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, encoding="utf-8") as f:
+                    self._done = {path: tuple(sig) for path, sig in json.load(f).items()}
+            except (OSError, ValueError):
+                logging.warning(f"Ignoring unreadable watch state: {state_path}")
+
+    def _scan(self):
+        """Return {path: (size, mtime_ns)} for candidate files in the directory."""
+        found = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                # Skip Office lock files (~$name.xlsx) and anything that is not an input file
+                if entry.name.startswith("~$") or not entry.name.lower().endswith(INPUT_EXTENSIONS):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue  # Removed between listing and stat
+                if entry.is_file():
+                    found[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return found
+
+    @staticmethod
+    def _readable(path):
+        """True if the file can be opened for reading (not locked by a writer)."""
+        try:
+            with open(path, "rb"):
+                return True
+        except OSError:
+            return False
+
+    def ready_files(self):
+        """
+        Scan once and return files that are new or changed and have settled.
+
+        Returns:
+            list[str]: Paths ready to process, oldest first.
+        """
+        now = time.monotonic()
+        found = self._scan()
+        ready = []
+
+        for path, signature in found.items():
+            if self._done.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[0] != signature:
+                self._pending[path] = (signature, now)  # New, or still being written
+            elif now - pending[1] >= self.settle_seconds and self._readable(path):
+                ready.append(path)
+
+        # Forget files that disappeared before settling
+        for path in list(self._pending):
+            if path not in found:
+                del self._pending[path]
+
+        return sorted(ready, key=lambda path: found[path][1])
+
+    def mark_done(self, path):
+        """Record the file's current version as processed and persist the state."""
+        signature = self._pending.pop(path, (None,))[0]
+        if signature is None:
+            return
+        self._done[path] = signature
+
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._done, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+
+def run_watch(args):
+    """
+    Run until interrupted, processing each settled input file in the watched directory.
+
+    Every file gets its own run_{timestamp}_{name} directory with journal,
+    results workbook and metrics. The connection pool, HTTP cache and
+    rate-limit state stay warm between files; the open-PR index is cleared per
+    file so it never trusts stale listings (re-listing is mostly ETag 304s),
+    and the retry budget starts over so it stays a per-run budget.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line options with args.watch set.
+    """
+    if not os.path.isdir(args.watch):
+        print(f"❌ Watch directory not found: {args.watch}")
+        return
+
+    os.makedirs(config.BASE_OUTPUT_DIR, exist_ok=True)
+    watcher = DirectoryWatcher(
+        args.watch, os.path.join(config.BASE_OUTPUT_DIR, WATCH_STATE_FILENAME), settle_seconds=WATCH_SETTLE_SECONDS
+    )
+    print(f"👀 Watching {args.watch} for .xlsx/.csv files (Ctrl+C to stop)...")
+    logging.info(f"Watching {args.watch}")
+
+    try:
+        while True:
+            for path in watcher.ready_files():
+                name = os.path.splitext(os.path.basename(path))[0]
+                print(f"\n📥 New input: {path}")
+                logging.info(f"Watch input: {path}")
+
+                output_dir, timestamp = prepare_output_dir(name=name)
+                metrics.reset()  # Per-file metrics
+                retry_policy.reset()
+                pr_index.clear()
+                parks_before = rate_limiter.parked
+                try:
+                    results, stats, _ = run_input_file(path, output_dir, timestamp, args, interactive=False)
+                except Exception as e:
+                    logging.exception(f"Watch input failed: {path}")
+                    print(f"❌ Failed to process {path}: {e}")
+                else:
+                    write_run_metrics(
+                        output_dir,
+                        summary={
+                            "input": path,
+                            "links": len(results),
+                            "stats": stats,
+                            "engine": args.engine,
+                            "connections": get_connection_stats(),
+                            "rate_limit_parks": rate_limiter.parked - parks_before,
+                        },
+                        prometheus=args.prometheus,
+                    )
+                # Failed files are not retried until they change again
+                watcher.mark_done(path)
+
+            time.sleep(WATCH_POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching.")
+
+# ------------------------ Main Logic ------------------------
+def run_input_file(input_path, output_dir, timestamp, args, interactive=True):
+    """
+    Create PRs for every compare link in one input file and save its results.
+
+    Args:
+        input_path (str): Excel file with compare links in the first column.
+        output_dir (str): Directory for this file's journal and result workbook.
+        timestamp (str): Timestamp string used to name the output file.
+        args (argparse.Namespace): Parsed command-line options.
+        interactive (bool): Passed to summarize_and_save_results().
+
+    Returns:
+        results (list[ResultRow]): All result rows for the file.
+        stats (dict): Count of outcomes: Created, Skipped, Duplicate, Error.
+        output_file (str): Path of the saved Excel file.
+    """
+    start = time.perf_counter()
+    usage_before = usage_snapshot()
+
+    # Generate standardized PR title with timestamp (PST)
+    pr_title = get_pr_title()
+
+    # Load compare links from input Excel file
+    with metrics.stage("excel_load"):
+        compare_links = load_compare_links(input_path)
+
+    # Canonicalize, de-duplicate and group links by repository
+    compare_links, plan = plan_links(compare_links)
+    print(f"🧭 Plan: {plan['input']} links → {plan['unique']} unique in {plan['repos']} repos "
+          f"({plan['duplicates']} duplicates dropped, {plan['normalized']} normalized, {plan['invalid']} invalid)")
+    logging.info(f"Link plan: { {key: value for key, value in plan.items() if key != 'repeats'} }")
+    metrics.count("plan_duplicates", plan["duplicates"])
+
+    # When resuming, keep finished rows and only retry errors / unprocessed links
+    done_results = []
+    if args.resume:
+        journaled = load_journal(output_dir)
+        done_results = [row for row in journaled.values() if row.status in RESUME_DONE_STATUSES]
+        done_links = {row.link for row in done_results}
+        compare_links = [link for link in compare_links if link not in done_links]
+        print(f"🔁 {len(done_results)} links already done; {len(compare_links)} to process")
+    journal = ResultJournal(output_dir)
+
+    # Optionally finish links that got their PR earlier today, from the run history
+    history_results = []
+    if args.skip_created_today:
+        history_results, compare_links = skip_created_today(compare_links)
+        print(f"📚 {len(history_results)} links already got a PR today; {len(compare_links)} left to process")
+        for row in history_results:
+            journal.append(row)
+
+    # Notify start of PR creation process
+    print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 🚀 Starting PR creation with title: {pr_title}")
+
+    # Optionally resolve Skipped/Duplicate links in bulk via GraphQL
+    preflight_results = []
+    if args.preflight:
+        with metrics.stage("preflight"):
+            preflight_results, compare_links = preflight_links(compare_links)
+        print(f"🛫 Pre-flight resolved {len(preflight_results)} links; {len(compare_links)} left to process")
+        for row in preflight_results:
+            journal.append(row)
+
+    # Process remaining compare links concurrently and track results
+    with metrics.stage("process_links"):
+        if args.shards:
+            results, stats = process_all_links_sharded(compare_links, pr_title, output_dir, args, journal)
+        elif args.engine == "asyncio":
+            results, stats = process_all_links_async(compare_links, pr_title, args.concurrency, journal)
+        else:
+            results, stats = process_all_links(compare_links, pr_title, journal)
+    journal.close()
+
+    for row in preflight_results + history_results + done_results:
+        results.append(row)
+        stats[row.status] += 1
+
+    # Report what de-duplication saved
+    if plan["duplicates"]:
+        saved = api_calls_saved(plan, results)
+        print(f"\n🧭 De-duplication saved {saved} API calls ({plan['duplicates']} duplicate links)")
+        logging.info(f"De-duplication saved {saved} API calls")
+        metrics.count("plan_api_calls_saved", saved)
+
+    # Print summary, save Excel output, and open PR links in browser
+    usage = usage_since(usage_before)
+    output_file = summarize_and_save_results(results, stats, output_dir, timestamp, interactive, usage)
+
+    # Add the run to the cross-run history
+    record_run_history(
+        output_dir, input_path, results, args, time.perf_counter() - start, usage["requests_sent"], output_file,
+    )
+    return results, stats, output_file
+
+
+def run_batch(args):
+    """
+    Process several input files headless in one process.
+
+    The connection pool, open-PR index, HTTP cache and rate-limit state are
+    module-level, so later files reuse what earlier files warmed up. Each
+    input gets its own sub-directory (journal + result workbook) under one
+    batch run directory, plus a combined batch_summary workbook.
+
+    Args:
+        args (argparse.Namespace): Parsed command-line options with args.inputs set.
+    """
+    paths = expand_input_paths(args.inputs)
+    if not paths:
+        print("❌ No input files to process.")
+        return
+
+    batch_dir, timestamp = prepare_output_dir(args.resume)
+    if batch_dir is None:
+        return
+    print(f"\n📦 Batch of {len(paths)} files → {batch_dir}")
+
+    summary_rows = []
+    totals = new_stats()
+    links = 0
+    for idx, (path, output_dir) in enumerate(input_output_dirs(batch_dir, paths).items(), 1):
+        print(f"\n📄 [{idx}/{len(paths)}] {path}")
+        logging.info(f"Batch input {idx}/{len(paths)}: {path}")
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        try:
+            results, stats, output_file = run_input_file(path, output_dir, timestamp, args, interactive=False)
+        except Exception as e:
+            # ---- One unreadable file must not stop the rest of the batch
+            logging.exception(f"Batch input failed: {path}")
+            print(f"❌ Failed to process {path}: {e}")
+            summary_rows.append([path, "-", "-", "-", "-", "-", round(time.perf_counter() - start, 1), f"Failed: {e}"])
+            continue
+
+        for status, count in stats.items():
+            totals[status] += count
+        links += len(results)
+        summary_rows.append([
+            path, len(results), stats["Created"], stats["Skipped"], stats["Duplicate"], stats["Error"],
+            round(time.perf_counter() - start, 1), output_file,
+        ])
+
+    # Combined summary across all input files
+    print(f"\n📦 Batch summary: {len(paths)} files, {links} links — {totals['Created']} Created, "
+          f"{totals['Skipped']} Skipped, {totals['Duplicate']} Duplicate, {totals['Error']} Error")
+    logging.info(f"Batch summary: files={len(paths)} links={links} {totals}")
+    summary_path = os.path.join(batch_dir, f"batch_summary_{timestamp}.xlsx")
+    write_results_workbook(summary_rows, summary_path, headers=BATCH_SUMMARY_HEADERS, sheet_title="Batch Summary")
+    print(f"💾 Batch summary saved to: {summary_path}")
+
+    write_run_metrics(
+        batch_dir,
+        summary={
+            "files": len(paths),
+            "links": links,
+            "stats": totals,
+            "engine": args.engine,
+            "connections": get_connection_stats(),
+            "rate_limit_parks": rate_limiter.parked,
+        },
+        prometheus=args.prometheus,
+    )
+
+
+def main():
+    """Main routine for pre-check, PR creation, and result reporting."""
+    args = parse_args()
+    config.COMPARE_MODE = args.compare_mode
+    config.HTTP_CACHE_ENABLED = not args.no_cache
+    config.CREATE_WORKERS = max(1, args.create_workers)
+
+    # Shard worker: claim and process shards of another process's run
+    if args.shard_worker:
+        run_shard_worker(args.shard_worker, args)
+        return
+
+    # Run history: query earlier runs, no PRs are created
+    if args.history or args.history_import:
+        run_history_command(args)
+        return
+
+    # Watch mode: long-running, processes files as they land
+    if args.watch:
+        if args.inputs or args.resume:
+            print("❌ --watch cannot be combined with input files or --resume.")
+            return
+        run_watch(args)
+        return
+
+    # Batch mode: many files, no prompts
+    if args.inputs:
+        run_batch(args)
+        return
+
+    # Step 1: Open pre-check links (e.g., sync PRs) before proceeding; the run log
+    # is opened in step 2, so their log records are held until then
+    buffer_run_logging()
+    with metrics.stage("precheck_links"):
+        open_links_from_excel(config.PRE_LINKS_FILE, probe=not args.no_probe)
+
+    # Step 2: Confirm with user and prepare output/log paths
+    confirmed, output_dir, timestamp = confirm_run_and_prepare_output(args.resume)
+    if not confirmed:
+        return  # Exit if user cancels
+
+    # Step 3: Load links, create PRs, save Excel output, and open PR links in browser
+    results, stats, _ = run_input_file(config.INPUT_PATH, output_dir, timestamp, args)
+
+    # Step 4: Write timing metrics next to the run log
+    write_run_metrics(
+        output_dir,
+        summary={
+            "links": len(results),
+            "stats": stats,
+            "engine": args.engine,
+            "connections": get_connection_stats(),
+            "rate_limit_parks": rate_limiter.parked,
+        },
+        prometheus=args.prometheus,
+    )
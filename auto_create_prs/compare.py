@@ -0,0 +1,213 @@
+"""Read compare data from GitHub: commit and changed-file counts of a compare link."""
+
+import re
+from urllib.parse import quote
+
+from . import config
+from .api import COMPARE_CHUNK_SIZE
+from .cache import cached_get, cached_get_async
+from .results import FILES_TRUNCATED
+
+
+# --------------------- Fetch Compare Data ----------------------
+def fetch_compare(session, org, repo, base, head):
+    """
+    Fetch the commit and changed-file counts for base...head.
+
+    In light mode only one commit is requested (per_page=1) and the body is
+    streamed through CompareScanner, so file patches are never held in memory.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        org (str): GitHub organization or username.
+        repo (str): Repository name.
+        base (str): Base branch name.
+        head (str): Head branch name.
+
+    Returns:
+        tuple: (status_code, commits, files_changed)
+    """
+    compare_url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/compare/{quote(base, safe='/:')}...{quote(head, safe='/:')}"
+
+    if config.COMPARE_MODE == "full":
+        status_code, counts = cached_get(session, compare_url, extract_compare_full)
+    else:
+        status_code, counts = cached_get(
+            session, compare_url, extract_compare_light, params={"per_page": 1}, stream=True
+        )
+
+    if status_code != 200:
+        return status_code, None, None
+    # The cache stores counts as JSON, which drops the TruncatedCount marker
+    return (status_code, *format_compare_counts(*counts))
+
+def extract_compare_full(response):
+    """cached_get() extractor: (commits, files_changed) from the whole compare JSON."""
+    if response.status_code != 200:
+        return None
+    return summarize_compare(response.json())
+
+def extract_compare_light(response):
+    """cached_get() extractor: (commits, files_changed) by streaming the compare body."""
+    with response:
+        if response.status_code != 200:
+            return None
+
+        scanner = CompareScanner()
+        for chunk in response.iter_content(chunk_size=COMPARE_CHUNK_SIZE):
+            scanner.feed(chunk)
+        scanner.close()
+
+    return format_compare_counts(scanner.total_commits, scanner.files)
+
+# --------------- Summarize Compare Data ----------------------
+def summarize_compare(data):
+    """
+    Extract the commit count and changed-file count from a compare payload.
+
+    Args:
+        data (dict): JSON payload from the GitHub compare endpoint.
+
+    Returns:
+        tuple: (commits, files_changed) where files_changed is FILES_TRUNCATED
+        when GitHub truncated the file list.
+    """
+    return format_compare_counts(data.get("total_commits"), len(data.get("files", [])))
+
+def format_compare_counts(total_commits, num_files):
+    """
+    Turn raw compare counts into the commits and files_changed of a ResultRow.
+
+    Args:
+        total_commits (int|None): Commits ahead, or None if not reported.
+        num_files (int): Number of entries in the compare file list.
+
+    Returns:
+        tuple: (commits, files_changed)
+    """
+    # GitHub truncates file list after 300 changes — indicate overflow
+    files_changed = FILES_TRUNCATED if num_files == FILES_TRUNCATED else num_files
+
+    return total_commits, files_changed
+
+
+class CompareScanner:
+    """
+    Incrementally scan a compare JSON body for `total_commits` and the number
+    of entries in `files`, without building the parsed document.
+
+    Only a few bytes of state are kept between chunks, so patches of any size
+    stream straight through.
+    """
+
+    _STRUCTURE = re.compile(rb'["{}\[\],:0-9]')
+    _STRING_END = re.compile(rb'["\\]')
+    _MAX_KEY = 32
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget everything fed so far, e.g. before a retried request streams its body again."""
+        self.total_commits = None
+        self.files = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string = None       # Buffer for a depth-1 key being read, else None
+        self._expect_key = False  # Next string at depth 1 is a key
+        self._key = None          # Last depth-1 key seen
+        self._number = None       # Digits of total_commits being read
+        self._files_depth = None  # Depth of the files array while inside it
+
+    def feed(self, chunk):
+        """Consume the next chunk of the response body (bytes)."""
+        pos, end = 0, len(chunk)
+        while pos < end:
+            # ---- Inside a string: jump to the next quote or backslash
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    pos += 1
+                    continue
+                match = self._STRING_END.search(chunk, pos)
+                stop = match.start() if match else end
+                if self._string is not None and len(self._string) < self._MAX_KEY:
+                    self._string += chunk[pos:stop]
+                if not match:
+                    return
+                if chunk[stop:stop + 1] == b"\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                    if self._string is not None:
+                        self._key = self._string.decode("utf-8", "replace")
+                        self._string = None
+                pos = stop + 1
+                continue
+
+            # ---- Reading the total_commits number
+            if self._number is not None:
+                digit = chunk[pos:pos + 1]
+                if digit.isdigit():
+                    self._number += digit
+                    pos += 1
+                    continue
+                self.total_commits = int(self._number)
+                self._number = None
+
+            # ---- Outside strings: jump to the next structural character
+            match = self._STRUCTURE.search(chunk, pos)
+            if not match:
+                return
+            char = chunk[match.start():match.start() + 1]
+            pos = match.end()
+
+            if char == b'"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._string = b""
+                    self._expect_key = False
+            elif char in b"{[":
+                self._depth += 1
+                if char == b"{" and self._files_depth == self._depth - 1:
+                    self.files += 1
+                if self._depth == 1:
+                    self._expect_key = True
+                elif char == b"[" and self._depth == 2 and self._key == "files":
+                    self._files_depth = 2
+            elif char in b"}]":
+                if self._files_depth == self._depth:
+                    self._files_depth = None
+                self._depth -= 1
+            elif char == b",":
+                if self._depth == 1:
+                    self._expect_key = True
+            elif char.isdigit() and self._depth == 1 and self._key == "total_commits":
+                self._number = char
+            # Colons and other digits belong to values we do not need
+
+    def close(self):
+        """Finish scanning once the body is exhausted."""
+        if self._number is not None:
+            self.total_commits = int(self._number)
+            self._number = None
+
+
+async def fetch_compare_async(session, org, repo, base, head):
+    """Asyncio counterpart of fetch_compare()."""
+    compare_url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/compare/{quote(base, safe='/:')}...{quote(head, safe='/:')}"
+    scanner = None if config.COMPARE_MODE == "full" else CompareScanner()
+    params = None if config.COMPARE_MODE == "full" else {"per_page": 1}
+
+    def extract(status, data):
+        if status != 200:
+            return None
+        if scanner is not None:
+            return format_compare_counts(scanner.total_commits, scanner.files)
+        return summarize_compare(data)
+
+    status, counts = await cached_get_async(session, compare_url, extract, params=params, scanner=scanner)
+    if status != 200:
+        return status, None, None
+    return (status, *format_compare_counts(*counts))
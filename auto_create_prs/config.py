@@ -0,0 +1,31 @@
+"""
+Configuration of auto_create_prs: edit the values below.
+
+Every module reads these settings as config.NAME when it uses them, so
+command-line options (and tools such as benchmarks/benchmark.py) can change
+them at runtime by assigning to this module.
+"""
+
+import os
+
+# ------------------- Configuration -------------------
+GITHUB_TOKEN = "your_token_here"  # Replace with your GitHub Token
+GITHUB_TOKENS = []  # Optional extra tokens (PATs or App installation tokens) to spread requests over
+INPUT_PATH = r"C:\Users\v-bowenyang\Desktop\Daily_Publishing\OPS-Publish-10_00.xlsx"
+PRE_LINKS_FILE = r"C:\Users\v-bowenyang\Desktop\Daily_Publishing\Sync_PR\OPS-Publish-10_00.csv"
+GITHUB_API_URL = "https://api.github.com"
+
+# Directory to save output results (log + Excel)
+BASE_OUTPUT_DIR = os.path.join(os.path.expanduser("~"), "Desktop", "PR_created_result")
+
+# Number of concurrent compare worker threads; the connection pool is sized to match
+MAX_WORKERS = 5
+
+# Workers creating PRs; kept low since GitHub throttles concurrent content-creating requests
+CREATE_WORKERS = 5
+
+# "light" streams the compare body through CompareScanner; "full" loads the whole JSON
+COMPARE_MODE = "light"
+
+# Revalidate GET responses against the on-disk HTTP cache (--no-cache turns it off)
+HTTP_CACHE_ENABLED = True
@@ -0,0 +1,373 @@
+"""Pipeline stages and the threaded and asyncio engines that run every link through them."""
+
+import asyncio
+import time
+import logging
+import threading
+import queue
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from . import config
+from .compare import fetch_compare, fetch_compare_async
+from .links import parse_compare_link
+from .pulls import create_pull_request, create_pull_request_async, pr_index
+from .ratelimit import rate_limiter
+from .results import ResultRow, ResultStatus, new_stats
+from .run_log import link_log_context, logged_stage
+from .run_metrics import metrics
+from .session import REQUEST_TIMEOUT, connection_trace_config, get_session, load_aiohttp
+
+
+# --------------------- Process Individual Link ------------------
+@logged_stage("compare")
+def compare_stage(session, link):
+    """
+    First pipeline stage: parse a compare link and check whether it needs a PR.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        link (str): GitHub compare link (e.g., https://github.com/org/repo/compare/base...head)
+
+    Returns:
+        tuple: (row, job)
+            - row: finished ResultRow when no PR is needed (Skipped or Error), else None
+            - job: (org, repo, base, head, commits, files_changed) for create_stage(), else None
+    """
+    logging.info(f"Processing: {link}")
+
+    try:
+        # ---- Parse the compare link to extract org/repo/base/head
+        org, repo, base, head = parse_compare_link(link)
+
+        # ---- Fetch commit and file change counts from the compare endpoint
+        status_code, commits, files_changed = fetch_compare(session, org, repo, base, head)
+
+        # ---- If compare endpoint is invalid (e.g. deleted branch), return error
+        if status_code == 404:
+            return ResultRow(link, ResultStatus.ERROR, reason="Compare link not valid."), None
+
+        # ---- Compare still failing after retries (5xx, rate limit, auth)
+        if status_code != 200:
+            return ResultRow(link, ResultStatus.ERROR, reason=f"Compare request failed: HTTP {status_code}."), None
+
+        # ---- Skip PR creation if there are no new commits
+        if commits == 0:
+            return ResultRow(
+                link, ResultStatus.SKIPPED, None, commits, files_changed, "No new commits to publish."
+            ), None
+
+        return None, (org, repo, base, head, commits, files_changed)
+
+    except Exception as e:
+        # ---- On any unexpected error, log and return as failed entry
+        logging.exception(f"Error processing {link}:")
+        return ResultRow(link, ResultStatus.ERROR, reason=str(e)), None
+
+@logged_stage("create")
+def create_stage(session, link, job, pr_title):
+    """
+    Second pipeline stage: create the pull request for a link that has new commits.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        link (str): GitHub compare link.
+        job (tuple): (org, repo, base, head, commits, files_changed) from compare_stage().
+        pr_title (str): Title to use when creating the pull request.
+
+    Returns:
+        ResultRow: (link, status, pr_link, commits, files_changed, reason)
+    """
+    org, repo, base, head, commits, files_changed = job
+    try:
+        status, pr_link, reason = create_pull_request(session, org, repo, base, head, pr_title)
+        return ResultRow(link, status, pr_link, commits, files_changed, reason)
+    except Exception as e:
+        logging.exception(f"Error processing {link}:")
+        return ResultRow(link, ResultStatus.ERROR, None, commits, files_changed, str(e))
+
+def process_link(link, pr_title):
+    """
+    Process a single GitHub compare link to determine if a pull request should be created.
+
+    Steps:
+    1. Parse link to extract repo and branch info.
+    2. Check commit diff from GitHub API.
+    3. If there are commits, attempt to create a PR.
+    4. Return detailed result for logging and reporting.
+
+    process_all_links() runs the two halves (compare_stage, create_stage) in
+    separate worker pools; this runs them back to back on the calling thread.
+
+    Args:
+        link (str): GitHub compare link (e.g., https://github.com/org/repo/compare/base...head)
+        pr_title (str): Title to use when creating the pull request.
+
+    Returns:
+        ResultRow: (link, status, pr_link, commits, files_changed, reason)
+    """
+    session = get_session()  # Thread's session, backed by the shared connection pool
+    row, job = compare_stage(session, link)
+    if row is not None:
+        return row
+    return create_stage(session, link, job, pr_title)
+
+# Links with new commits that may wait for a create worker before compare workers block
+CREATE_QUEUE_SIZE = 50
+
+
+def stage_error_row(link, stage, error):
+    """
+    Log an exception that escaped a pipeline stage and record it as an Error
+    row, so one failing link cannot stall the threaded pipeline.
+    """
+    with link_log_context(link, stage):
+        logging.error(f"{stage.capitalize()} stage raised {error!r}", exc_info=error)
+    return ResultRow(link, ResultStatus.ERROR, reason=f"{stage.capitalize()} stage failed: {error}")
+
+
+def process_all_links(compare_links, pr_title, journal=None):
+    """
+    Process all GitHub compare links as a two-stage pipeline and collect PR
+    creation results with status statistics.
+
+    MAX_WORKERS compare workers check every link; links with new commits are
+    handed over a bounded queue to CREATE_WORKERS create workers. Skipped and
+    invalid links finish as soon as their compare returns, and slow PR-creation
+    POSTs never hold up the compare checks. When the queue is full, compare
+    workers wait, so the run never gets far ahead of PR creation.
+
+    Args:
+        compare_links (list[str]): List of GitHub compare URLs to process.
+        pr_title (str): Title to use when creating pull requests.
+        journal (ResultJournal|None): If given, each finished row is appended to it.
+
+    Returns:
+        results (list[ResultRow]): One row per link.
+        stats (dict): Count of outcomes: Created, Skipped, Duplicate, Error.
+    """
+    results = []
+    stats = new_stats()
+
+    # Let the rate-limit scheduler admit up to one request per worker in either stage
+    rate_limiter.max_concurrency = config.MAX_WORKERS + config.CREATE_WORKERS
+
+    create_queue = queue.Queue(maxsize=CREATE_QUEUE_SIZE)
+    done_queue = queue.Queue()
+
+    def run_compare(link, submitted):
+        # Record how long the link waited for a free compare worker
+        start = time.perf_counter()
+        metrics.observe("queue_wait_worker_pool", start - submitted)
+        try:
+            row, job = compare_stage(get_session(), link)
+        except Exception as e:
+            row = stage_error_row(link, "compare", e)
+        if row is not None:
+            metrics.observe("link_duration", time.perf_counter() - start)
+            done_queue.put(row)
+        else:
+            create_queue.put((link, job, start, time.perf_counter()))  # Blocks while the queue is full
+
+    def run_create():
+        # Every queued link must reach done_queue, even if this worker cannot
+        # create PRs: a dead worker would hang the run on a full create_queue
+        try:
+            session, failure = get_session(), None
+        except Exception as e:
+            session, failure = None, e
+        while True:
+            item = create_queue.get()
+            if item is None:
+                return
+            link, job, start, queued = item
+            metrics.observe("queue_wait_create", time.perf_counter() - queued)
+            try:
+                if failure is not None:
+                    raise failure
+                row = create_stage(session, link, job, pr_title)
+            except Exception as e:
+                row = stage_error_row(link, "create", e)
+            metrics.observe("link_duration", time.perf_counter() - start)
+            done_queue.put(row)
+
+    creators = [threading.Thread(target=run_create, daemon=True) for _ in range(config.CREATE_WORKERS)]
+    for creator in creators:
+        creator.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=config.MAX_WORKERS) as executor:
+            # Submit each compare link as a separate task
+            futures = [executor.submit(run_compare, link, time.perf_counter()) for link in compare_links]
+
+            # Collect results as they complete, from either stage
+            for idx in range(1, len(compare_links) + 1):
+                result = done_queue.get()
+                results.append(result)
+                if journal is not None:
+                    journal.append(result)
+
+                # Increment the appropriate status counter
+                stats[result.status] += 1
+
+                # Print progress every 5 links or at the end
+                if idx % 5 == 0 or idx == len(compare_links):
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] Processed {idx}/{len(compare_links)} links...")
+
+            for future in futures:
+                future.result()
+    finally:
+        for _ in creators:
+            create_queue.put(None)
+        for creator in creators:
+            creator.join()
+
+    return results, stats
+
+# -------------- Asyncio Engine --------------------------------
+# Default number of links processed concurrently by the asyncio engine
+ASYNC_CONCURRENCY = 20
+
+
+@logged_stage("compare")
+async def compare_stage_async(session, link):
+    """Asyncio counterpart of compare_stage(); returns (row, job)."""
+    logging.info(f"Processing: {link}")
+
+    try:
+        # ---- Parse the compare link to extract org/repo/base/head
+        org, repo, base, head = parse_compare_link(link)
+
+        # ---- Fetch commit and file change counts from the compare endpoint
+        status, commits, files_changed = await fetch_compare_async(session, org, repo, base, head)
+        if status == 404:
+            return ResultRow(link, ResultStatus.ERROR, reason="Compare link not valid."), None
+        if status != 200:
+            return ResultRow(link, ResultStatus.ERROR, reason=f"Compare request failed: HTTP {status}."), None
+
+        # ---- Skip PR creation if there are no new commits
+        if commits == 0:
+            return ResultRow(
+                link, ResultStatus.SKIPPED, None, commits, files_changed, "No new commits to publish."
+            ), None
+
+        return None, (org, repo, base, head, commits, files_changed)
+
+    except Exception as e:
+        # ---- On any unexpected error, log and return as failed entry
+        logging.exception(f"Error processing {link}:")
+        return ResultRow(link, ResultStatus.ERROR, reason=str(e)), None
+
+
+@logged_stage("create")
+async def create_stage_async(session, link, job, pr_title):
+    """Asyncio counterpart of create_stage()."""
+    org, repo, base, head, commits, files_changed = job
+    try:
+        status, pr_link, reason = await create_pull_request_async(session, org, repo, base, head, pr_title)
+        return ResultRow(link, status, pr_link, commits, files_changed, reason)
+    except Exception as e:
+        logging.exception(f"Error processing {link}:")
+        return ResultRow(link, ResultStatus.ERROR, None, commits, files_changed, str(e))
+
+
+async def process_link_async(session, link, pr_title):
+    """
+    Asyncio counterpart of process_link().
+
+    Args:
+        session (aiohttp.ClientSession): Shared authenticated GitHub session.
+        link (str): GitHub compare link.
+        pr_title (str): Title to use when creating the pull request.
+
+    Returns:
+        ResultRow: (link, status, pr_link, commits, files_changed, reason)
+    """
+    row, job = await compare_stage_async(session, link)
+    if row is not None:
+        return row
+    return await create_stage_async(session, link, job, pr_title)
+
+
+async def _process_all_links_async(compare_links, pr_title, concurrency, journal):
+    """
+    Run every link through the compare and create stages, with at most
+    `concurrency` compares and CREATE_WORKERS PR creations in flight.
+    """
+    aiohttp = load_aiohttp()
+    results = []
+    stats = new_stats()
+    compare_slots = asyncio.Semaphore(concurrency)
+    create_slots = asyncio.Semaphore(config.CREATE_WORKERS)
+    rate_limiter.max_concurrency = concurrency + config.CREATE_WORKERS
+    pr_index.reset_async_locks()
+
+    # One connector for the whole run: keep-alive connections capped at the concurrency level
+    connector = aiohttp.TCPConnector(limit=concurrency + config.CREATE_WORKERS)
+    timeout = aiohttp.ClientTimeout(connect=REQUEST_TIMEOUT[0], sock_read=REQUEST_TIMEOUT[1])
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[connection_trace_config()],
+    ) as session:
+
+        async def bounded(link):
+            submitted = time.perf_counter()
+            async with compare_slots:
+                # Record how long the link waited for a free compare slot
+                start = time.perf_counter()
+                metrics.observe("queue_wait_worker_pool", start - submitted)
+                row, job = await compare_stage_async(session, link)
+
+            # Links with new commits wait for a create slot without holding a compare slot
+            if row is None:
+                queued = time.perf_counter()
+                async with create_slots:
+                    metrics.observe("queue_wait_create", time.perf_counter() - queued)
+                    row = await create_stage_async(session, link, job, pr_title)
+
+            metrics.observe("link_duration", time.perf_counter() - start)
+            return row
+
+        tasks = [asyncio.ensure_future(bounded(link)) for link in compare_links]
+
+        # Collect results as they complete
+        for idx, task in enumerate(asyncio.as_completed(tasks), 1):
+            result = await task
+            results.append(result)
+            if journal is not None:
+                journal.append(result)
+
+            # Increment the appropriate status counter
+            stats[result.status] += 1
+
+            # Print progress every 5 links or at the end
+            if idx % 5 == 0 or idx == len(compare_links):
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processed {idx}/{len(compare_links)} links...")
+
+    return results, stats
+
+
+def process_all_links_async(compare_links, pr_title, concurrency=ASYNC_CONCURRENCY, journal=None):
+    """
+    Process all GitHub compare links on an asyncio event loop with aiohttp,
+    keeping at most `concurrency` compares and CREATE_WORKERS PR creations in flight.
+
+    Falls back to the threaded process_all_links() when aiohttp is not installed.
+
+    Args:
+        compare_links (list[str]): List of GitHub compare URLs to process.
+        pr_title (str): Title to use when creating pull requests.
+        concurrency (int): Maximum number of compare checks in flight.
+        journal (ResultJournal|None): If given, each finished row is appended to it.
+
+    Returns:
+        results (list[ResultRow]): Same shape as process_all_links().
+        stats (dict): Same shape as process_all_links().
+    """
+    if load_aiohttp() is None:
+        print("⚠️ aiohttp is not installed (pip install aiohttp). Falling back to threaded engine.")
+        logging.warning("aiohttp not installed; falling back to threaded engine.")
+        return process_all_links(compare_links, pr_title, journal)
+
+    return asyncio.run(_process_all_links_async(compare_links, pr_title, concurrency, journal))
@@ -0,0 +1,341 @@
+"""Indexed SQLite history of every run's results, and the --history query command."""
+
+import os
+import argparse
+import glob
+import logging
+from datetime import datetime
+
+from . import config
+from .journal import JOURNAL_FILENAME, load_journal
+from .links import canonical_compare, parse_compare_link
+from .results import ResultRow, ResultStatus, TruncatedCount, format_cell, new_stats
+
+
+# -------------- Run History -----------------------------------
+# SQLite file under BASE_OUTPUT_DIR that collects the result rows of every run
+HISTORY_FILENAME = "run_history.sqlite3"
+
+# Record each input file's results in the run history
+HISTORY_ENABLED = True
+
+# Columns --history can total by
+HISTORY_GROUPS = {"repo": "org || '/' || repo", "status": "status", "day": "day", "run": "run_id"}
+
+HISTORY_ROW_HEADERS = ["Time", "Result", "Compare Link", "PR Link", "Commits", "Files", "Reason"]
+
+HISTORY_GROUP_HEADERS = ["Links", "Created", "Skipped", "Duplicate", "Error", "Commits", "Files"]
+
+
+class RunHistory:
+    """
+    Indexed SQLite store of every run's result rows, for queries across runs.
+
+    `runs` holds one row per run directory (counts, wall time, requests
+    sent); `results` holds one row per (run, link). Links, (org, repo),
+    status and day are indexed, so questions over months of runs are index
+    lookups instead of opening workbooks. Recording a run again (e.g. after
+    --resume) replaces its earlier rows.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(config.BASE_OUTPUT_DIR, HISTORY_FILENAME)
+        import sqlite3
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Autocommit; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY, day TEXT NOT NULL, finished TEXT NOT NULL, input TEXT,
+                engine TEXT, links INTEGER, created INTEGER, skipped INTEGER, duplicate INTEGER,
+                error INTEGER, seconds REAL, requests INTEGER, result_file TEXT);
+            CREATE TABLE IF NOT EXISTS results (
+                run_id TEXT NOT NULL, link TEXT NOT NULL, org TEXT, repo TEXT, status TEXT NOT NULL,
+                pr_link TEXT, commits INTEGER, files_changed INTEGER, files_truncated INTEGER,
+                reason TEXT, day TEXT NOT NULL, time TEXT NOT NULL, PRIMARY KEY (run_id, link));
+            CREATE INDEX IF NOT EXISTS results_link ON results (link, time);
+            CREATE INDEX IF NOT EXISTS results_repo ON results (org, repo, day);
+            CREATE INDEX IF NOT EXISTS results_status ON results (status, day);
+            CREATE INDEX IF NOT EXISTS results_day ON results (day);
+        """)
+
+    def record_run(self, run_id, rows, input_path=None, engine=None, seconds=None, requests=None,
+                   result_file=None, finished=None):
+        """
+        Store (or replace) one run's result rows and totals.
+
+        Args:
+            run_id (str): Absolute run directory (per input file in batch mode).
+            rows (list[ResultRow]): Every result row of the run.
+            input_path (str|None): Input file the links came from.
+            engine (str|None): Execution engine used.
+            seconds (float|None): Wall time of the run.
+            requests (int|None): GitHub requests sent during the run.
+            result_file (str|None): Saved results workbook.
+            finished (datetime|None): When the run finished; defaults to now.
+        """
+        finished = finished or datetime.now()
+        day = finished.strftime("%Y-%m-%d")
+        time_str = finished.isoformat(timespec="seconds")
+
+        stats = new_stats()
+        values = []
+        for row in rows:
+            status = ResultStatus(row.status)
+            stats[status] += 1
+            try:
+                org, repo, _, _ = parse_compare_link(row.link)
+                org, repo = org.lower(), repo.lower()
+            except ValueError:
+                org = repo = None
+            files_changed = None if row.files_changed is None else int(row.files_changed)
+            values.append((
+                run_id, row.link, org, repo, status.value, row.pr_link, row.commits, files_changed,
+                int(isinstance(row.files_changed, TruncatedCount)), row.reason, day, time_str,
+            ))
+
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("DELETE FROM results WHERE run_id = ?", (run_id,))
+            self._db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values)
+            self._db.execute(
+                "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, day, time_str, input_path, engine, len(rows), stats["Created"], stats["Skipped"],
+                 stats["Duplicate"], stats["Error"], seconds, requests, result_file),
+            )
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def has_run(self, run_id):
+        return self._db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone() is not None
+
+    @staticmethod
+    def link_key(link):
+        """The canonical_compare() key of a link, or the link itself if it is not a compare link."""
+        try:
+            return canonical_compare(link)[1]
+        except ValueError:
+            return link
+
+    def created_on(self, day):
+        """
+        Return {link_key(link): pr_link} for every link that got a PR created on `day`.
+
+        Keys are compared the way plan_links() deduplicates, so a link written
+        with different org/repo casing or encoding still finds its PR.
+
+        Args:
+            day (str): Date as YYYY-MM-DD.
+        """
+        return {
+            self.link_key(link): pr_link
+            for link, pr_link in self._db.execute(
+                "SELECT link, pr_link FROM results WHERE status = ? AND day = ? ORDER BY time",
+                (ResultStatus.CREATED.value, day),
+            )
+        }
+
+    @staticmethod
+    def _filters(link=None, repo=None, status=None, since=None, until=None):
+        """Build the WHERE clause and parameters shared by query() and totals()."""
+        clauses, params = [], []
+        if link:
+            try:
+                canonical, (org, name, _, _) = canonical_compare(link)
+            except ValueError:
+                # Not a compare link; match it as given
+                clauses.append("link = ?")
+                params.append(link)
+            else:
+                # Org/repo casing varies between input files; branch names are exact,
+                # and recorded links carry plan_links()' canonical encoding
+                clauses.append("org = ? AND repo = ? AND substr(link, instr(link, '/compare/') + 9) = ?")
+                params.extend([org, name, canonical.partition("/compare/")[2]])
+        if repo:
+            org, _, name = repo.lower().strip("/").partition("/")
+            clauses.append("org = ?")
+            params.append(org)
+            if name:
+                clauses.append("repo = ?")
+                params.append(name)
+        if status:
+            clauses.append("status = ?")
+            params.append(ResultStatus(status).value)
+        if since:
+            clauses.append("day >= ?")
+            params.append(since)
+        if until:
+            clauses.append("day <= ?")
+            params.append(until)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=50, **filters):
+        """
+        Return the newest matching result rows.
+
+        Args:
+            limit (int): Maximum number of rows.
+            **filters: link, repo ("org" or "org/repo"), status, since/until (YYYY-MM-DD).
+
+        Returns:
+            list[list]: Rows in HISTORY_ROW_HEADERS order.
+        """
+        where, params = self._filters(**filters)
+        rows = self._db.execute(
+            "SELECT time, status, link, pr_link, commits, files_changed, files_truncated, reason "
+            f"FROM results{where} ORDER BY time DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [
+            [time_str, status, link, pr_link, commits,
+             TruncatedCount(files) if truncated and files is not None else files, reason]
+            for time_str, status, link, pr_link, commits, files, truncated, reason in rows
+        ]
+
+    def totals(self, group_by, limit=50, **filters):
+        """
+        Total matching result rows per repo, status, day or run.
+
+        Args:
+            group_by (str): Key of HISTORY_GROUPS.
+            limit (int): Maximum number of groups.
+            **filters: Same as query().
+
+        Returns:
+            list[list]: [group, *HISTORY_GROUP_HEADERS] rows; newest first for day/run,
+            otherwise largest first.
+        """
+        where, params = self._filters(**filters)
+        order = "grp DESC" if group_by in ("day", "run") else "COUNT(*) DESC, grp"
+        return [list(row) for row in self._db.execute(
+            f"SELECT {HISTORY_GROUPS[group_by]} AS grp, COUNT(*), "
+            "SUM(status = 'Created'), SUM(status = 'Skipped'), SUM(status = 'Duplicate'), SUM(status = 'Error'), "
+            f"SUM(commits), SUM(files_changed) FROM results{where} GROUP BY grp ORDER BY {order} LIMIT ?",
+            (*params, limit),
+        )]
+
+    def import_journals(self, base_dir):
+        """
+        Record every run directory under base_dir that is not in the history yet, from its journal.
+
+        Returns:
+            int: Number of runs imported.
+        """
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(base_dir, "**", JOURNAL_FILENAME), recursive=True)):
+            run_dir = os.path.dirname(os.path.abspath(path))
+            if self.has_run(run_dir):
+                continue
+            rows = list(load_journal(run_dir).values())
+            if rows:
+                self.record_run(run_dir, rows, finished=datetime.fromtimestamp(os.path.getmtime(path)))
+                imported += 1
+        return imported
+
+    def close(self):
+        self._db.close()
+
+
+def history_day(value):
+    """argparse type for --since/--until: a YYYY-MM-DD date."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}")
+
+
+def print_table(headers, rows):
+    """Print rows as left-aligned columns, rendering cells like the Excel output."""
+    lines = [headers] + [[str(format_cell(value)) for value in row] for row in rows]
+    widths = [max(len(line[idx]) for line in lines) for idx in range(len(headers))]
+    for line in lines:
+        print("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip())
+
+
+def run_history_command(args):
+    """Handle --history-import and --history: update or query the run history, then return."""
+    path = os.path.join(config.BASE_OUTPUT_DIR, HISTORY_FILENAME)
+    if args.history_import:
+        history = RunHistory(path)
+        try:
+            imported = history.import_journals(config.BASE_OUTPUT_DIR)
+        finally:
+            history.close()
+        print(f"📚 Imported {imported} earlier runs into {path}")
+        if not args.history:
+            return
+
+    if not os.path.exists(path):
+        print(f"ℹ️ No run history yet ({path}). Runs are recorded as they finish; "
+              f"add earlier runs with --history-import.")
+        return
+
+    filters = {"link": args.link, "repo": args.repo, "status": args.status, "since": args.since, "until": args.until}
+    history = RunHistory(path)
+    try:
+        if args.group_by:
+            headers = [args.group_by.capitalize()] + HISTORY_GROUP_HEADERS
+            rows = history.totals(args.group_by, args.limit, **filters)
+        else:
+            headers = HISTORY_ROW_HEADERS
+            rows = history.query(args.limit, **filters)
+    finally:
+        history.close()
+
+    if not rows:
+        print("ℹ️ No matching results in the run history.")
+        return
+    print_table(headers, rows)
+
+
+def record_run_history(output_dir, input_path, results, args, seconds, requests, result_file):
+    """Add one finished run to the run history; a history failure never fails the run."""
+    if not HISTORY_ENABLED:
+        return
+    try:
+        history = RunHistory()
+        try:
+            history.record_run(
+                os.path.abspath(output_dir), results, input_path=os.path.abspath(input_path), engine=args.engine,
+                seconds=round(seconds, 3), requests=requests, result_file=result_file,
+            )
+        finally:
+            history.close()
+    except Exception as e:
+        logging.exception("Could not record the run in the run history")
+        print(f"⚠️ Run history not updated: {e}")
+
+
+def skip_created_today(compare_links):
+    """
+    Finish links whose PR was already created today, per the run history, without API calls.
+
+    Args:
+        compare_links (list[str]): Links still to process.
+
+    Returns:
+        tuple: (rows, remaining) — Duplicate rows for links created earlier today, and the other links.
+    """
+    path = os.path.join(config.BASE_OUTPUT_DIR, HISTORY_FILENAME)
+    if not os.path.exists(path):
+        return [], compare_links
+
+    history = RunHistory(path)
+    try:
+        created = history.created_on(datetime.now().strftime("%Y-%m-%d"))
+    finally:
+        history.close()
+
+    rows, remaining = [], []
+    for link in compare_links:
+        key = RunHistory.link_key(link)
+        if key in created:
+            rows.append(ResultRow(
+                link, ResultStatus.DUPLICATE, created[key], reason="PR already created today (run history)."
+            ))
+        else:
+            remaining.append(link)
+    return rows, remaining
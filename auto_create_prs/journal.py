@@ -0,0 +1,80 @@
+"""Append-only journal of finished result rows, used to resume an interrupted run."""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+
+from .results import ResultRow, ResultStatus
+
+
+# -------------- Result Journal --------------------------------
+# Append-only JSONL file in the run directory holding every finished row
+JOURNAL_FILENAME = "results_journal.jsonl"
+
+# Statuses that are final; a resumed run only retries the rest
+RESUME_DONE_STATUSES = (ResultStatus.CREATED, ResultStatus.SKIPPED, ResultStatus.DUPLICATE)
+
+
+class ResultJournal:
+    """
+    Durable, append-only record of finished result rows for one run.
+
+    Every row is written as one JSON line, flushed and fsynced before
+    append() returns, so a killed process loses at most the row in flight.
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, JOURNAL_FILENAME)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+        # Start on a fresh line if an earlier run died mid-write
+        if self._file.tell() > 0:
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+
+    def append(self, row):
+        """Durably record one ResultRow."""
+        record = row.to_record()
+        record["time"] = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def load_journal(output_dir):
+    """
+    Read the latest result row per link from a run's journal.
+
+    A truncated last line (process killed mid-write) is ignored.
+
+    Args:
+        output_dir (str): Run directory containing the journal.
+
+    Returns:
+        dict: link → ResultRow, last entry wins.
+    """
+    rows = {}
+    path = os.path.join(output_dir, JOURNAL_FILENAME)
+    if not os.path.exists(path):
+        return rows
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logging.warning(f"Skipping unreadable journal line in {path}")
+                continue
+            rows[record["link"]] = ResultRow.from_record(record)
+
+    return rows
@@ -0,0 +1,177 @@
+"""Load, parse, canonicalize and de-duplicate compare links."""
+
+import csv
+from datetime import datetime
+from urllib.parse import quote, unquote, urlparse
+
+
+# --------------------- PR Title Generator ---------------------
+def get_pr_title():
+    """
+    Generate a pull request title based on current US Pacific time.
+
+    Format:
+        {month}/{day}/{year} {AM/PM} Publish
+
+    Example:
+        6/9/2025 AM Publish
+
+    Returns:
+        str: A timestamped PR title indicating the publish batch.
+    """
+    # Get the current time in US Pacific timezone (auto handles PST/PDT)
+    from zoneinfo import ZoneInfo
+
+    now_pacific = datetime.now(ZoneInfo("America/Los_Angeles"))
+
+    # Determine AM/PM marker based on hour
+    hour = now_pacific.hour
+    meridiem = "AM" if hour < 12 else "PM"
+
+    # Construct the PR title string
+    return f"{now_pacific.month}/{now_pacific.day}/{now_pacific.year} {meridiem} Publish"
+
+# --------------------- Parse Compare Links --------------------
+def parse_compare_link(link):
+    """
+    Parse a GitHub compare URL and extract organization, repo, base, and head branch names.
+
+    Expected format:
+        https://github.com/{org}/{repo}/compare/{base}...{head}
+
+    Args:
+        link (str): GitHub compare URL.
+
+    Returns:
+        tuple: (org, repo, base, head)
+
+    Raises:
+        ValueError: If the link is malformed or missing expected components.
+    """
+    try:
+        # Use urlparse to extract the path portion of the URL
+        parsed = urlparse(link)
+        parts = parsed.path.strip("/").split("/")
+
+        # Check basic structure validity
+        if len(parts) < 4 or parts[2] != "compare":
+            raise ValueError(f"Invalid compare link format: {link}")
+
+        # Extract org, repo, and compare segment (branch names may contain "/" or be URL-encoded)
+        org, repo = parts[:2]
+        compare_part = unquote("/".join(parts[3:]))
+
+        # Split base and head branches using '...'
+        base, head = compare_part.split("...")[0:2]
+        if not base or not head:
+            raise ValueError(f"Invalid compare link format: {link}")
+
+        return org, repo, base, head
+
+    except Exception:
+        # Raise explicit error if parsing fails
+        raise ValueError(f"Invalid compare link format: {link}")
+
+# --------------------- Load Links from Excel --------------------
+def load_compare_links(path):
+    """Read compare links from the first column of an Excel file (streamed, read-only) or a CSV file."""
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header row
+            return [row[0].strip() for row in reader if row and row[0].strip().startswith("http")]
+
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        sheet = wb.active
+        links = [row[0].strip() for row in sheet.iter_rows(min_row=2, max_col=1, values_only=True)
+                 if row and row[0] and isinstance(row[0], str) and row[0].startswith("http")]
+    finally:
+        wb.close()  # Read-only workbooks keep the file handle open until closed
+    return links
+
+# --------------------- Plan Links ------------------------------
+def canonical_compare(link):
+    """
+    Canonicalize a compare link.
+
+    Drops query strings and fragments (e.g. ?expand=1), normalizes the
+    URL encoding of branch names and strips an "org:" prefix from a head in
+    the same organization. Org and repo keep their casing for display, but
+    the key ignores it, since GitHub does. Branch names in the canonical link
+    are re-encoded, so parsing it again gives back the same key ("fix#12",
+    "100%25" and names with spaces survive the round trip).
+
+    Args:
+        link (str): GitHub compare link.
+
+    Returns:
+        tuple: (canonical_link, key) where key is (org, repo, base, head) with org/repo lowercased.
+
+    Raises:
+        ValueError: If the link is malformed.
+    """
+    org, repo, base, head = parse_compare_link(link)
+    owner, sep, branch = head.partition(":")
+    if sep and owner.lower() == org.lower():
+        head = branch
+    canonical = f"https://github.com/{org}/{repo}/compare/{quote(base, safe='/')}...{quote(head, safe='/')}"
+    return canonical, (org.lower(), repo.lower(), base, head)
+
+
+def plan_links(links):
+    """
+    Canonicalize, de-duplicate and order compare links before any API call.
+
+    - Exact and semantic duplicates (same repo/base/head after
+      canonicalization) are processed once; the first occurrence wins.
+    - Links are grouped by repository, in order of each repository's first
+      appearance, so one repo's compare checks, PR listing and cached
+      responses are used close together.
+    - Malformed links are kept (once) at the end, so they still appear as Error rows.
+
+    Args:
+        links (list[str]): Compare links as read from the input file.
+
+    Returns:
+        planned (list[str]): Links to process.
+        report (dict): input, unique, duplicates, normalized, invalid, repos, and
+            repeats ({canonical link: extra occurrences}) for api_calls_saved().
+    """
+    by_repo = {}  # (org, repo) → canonical links, in first-seen order
+    seen = {}  # key → canonical link
+    repeats = {}
+    invalid = []
+    duplicates = normalized = 0
+
+    for link in links:
+        try:
+            canonical, key = canonical_compare(link)
+        except ValueError:
+            if link in invalid:
+                duplicates += 1
+            else:
+                invalid.append(link)
+            continue
+
+        if key in seen:
+            duplicates += 1
+            repeats[seen[key]] = repeats.get(seen[key], 0) + 1
+            continue
+        seen[key] = canonical
+        normalized += canonical != link
+        by_repo.setdefault(key[:2], []).append(canonical)
+
+    planned = [link for repo_links in by_repo.values() for link in repo_links] + invalid
+    report = {
+        "input": len(links),
+        "unique": len(planned),
+        "duplicates": duplicates,
+        "normalized": normalized,
+        "invalid": len(invalid),
+        "repos": len(by_repo),
+        "repeats": repeats,
+    }
+    return planned, report
@@ -0,0 +1,355 @@
+"""Triage pre-check (sync) PR links through the API and open the ones that need a look."""
+
+import os
+import time
+import math
+import csv
+import logging
+import subprocess
+from datetime import datetime
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from . import config
+from .cache import cached_get
+from .ratelimit import rate_limiter
+from .results import ResultStatus, write_results_workbook
+from .session import get_session
+
+
+# -------- Open Links in Edge Browser (Grouped Tabs) --------
+def open_links_in_edge_window_grouped(links, group_size=15):
+    """
+    Open a list of URLs in Microsoft Edge, dividing them into multiple windows
+    with a specified number of tabs per window to avoid overload.
+
+    Args:
+        links (list): List of URLs to open.
+        group_size (int): Approximate number of tabs per browser window.
+    """
+    # Path to Microsoft Edge executable (adjust if installed elsewhere)
+    edge_path = r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe"
+
+    # Validate Edge installation path
+    if not os.path.exists(edge_path):
+        print()
+        print(f"❌ Microsoft Edge not found at: {edge_path}")
+        return
+
+    total = len(links)
+    if total == 0:
+        return  # No links to open
+
+    # Calculate number of browser windows and actual group size
+    num_groups = math.ceil(total / group_size)
+    group_size = math.ceil(total / num_groups)  # Redistribute evenly
+
+    print()
+    print(f"🌐 Opening {total} links in {num_groups} Edge windows (~{group_size} tabs each)...")
+
+    # Launch Edge windows in batches
+    for i in range(0, total, group_size):
+        group = links[i:i + group_size]
+        subprocess.Popen([edge_path, "--new-window"] + group)
+        time.sleep(1)  # Small delay to prevent browser overload
+
+# -------------- Probe Pre-check PRs ---------------------------
+# Pre-check PRs probed through the API at once
+PROBE_WORKERS = 10
+
+# Triage labels whose links are opened in the browser; the rest need no human look
+PRECHECK_ATTENTION = ("Conflict", "Checks failing", "Mergeability unknown", "Blocked", "Closed", "Unknown")
+
+# GitHub computes mergeability in the background after a PR is first read;
+# wait this long before reading it once more
+MERGEABLE_RETRY_SECONDS = 3
+
+PRECHECK_HEADERS = ["PR Link", "Triage", "State", "Mergeable", "Checks", "Reason"]
+
+# Check-run conclusions that count as a failed check
+FAILED_CONCLUSIONS = ("failure", "timed_out", "cancelled", "action_required", "startup_failure")
+
+
+def parse_pr_link(link):
+    """
+    Parse a GitHub pull request URL.
+
+    Expected format:
+        https://github.com/{org}/{repo}/pull/{number}
+
+    Args:
+        link (str): GitHub pull request URL (trailing /files, /checks etc. are ignored).
+
+    Returns:
+        tuple: (org, repo, number)
+
+    Raises:
+        ValueError: If the link is not a pull request link.
+    """
+    parts = urlparse(link).path.strip("/").split("/")
+    if len(parts) < 4 or parts[2] != "pull" or not parts[3].isdigit():
+        raise ValueError(f"Invalid pull request link format: {link}")
+    return parts[0], parts[1], int(parts[3])
+
+def extract_pull_state(response):
+    """cached_get() extractor: the fields of a pull request that triage needs."""
+    if response.status_code != 200:
+        return None
+    pr = response.json()
+    return {
+        "state": pr.get("state"),
+        "merged": bool(pr.get("merged")),
+        "mergeable": pr.get("mergeable"),
+        "mergeable_state": pr.get("mergeable_state") or "unknown",
+        "sha": (pr.get("head") or {}).get("sha"),
+    }
+
+def extract_commit_status(response):
+    """cached_get() extractor: [(context, state)] of a commit's combined status."""
+    if response.status_code != 200:
+        return None
+    return [(status.get("context"), status.get("state")) for status in response.json().get("statuses", [])]
+
+def extract_check_runs(response):
+    """cached_get() extractor: [(name, status, conclusion)] of a commit's check runs."""
+    if response.status_code != 200:
+        return None
+    return [
+        (run.get("name"), run.get("status"), run.get("conclusion"))
+        for run in response.json().get("check_runs", [])
+    ]
+
+def summarize_checks(statuses, check_runs):
+    """
+    Fold commit statuses and check runs into one verdict.
+
+    Args:
+        statuses (list|None): [(context, state)] from extract_commit_status().
+        check_runs (list|None): [(name, status, conclusion)] from extract_check_runs().
+
+    Returns:
+        tuple: (checks, detail) where checks is "success", "failure", "pending" or "none".
+    """
+    failed, pending, total = [], 0, 0
+    for context, state in statuses or []:
+        total += 1
+        if state in ("failure", "error"):
+            failed.append(context)
+        elif state == "pending":
+            pending += 1
+    for name, status, conclusion in check_runs or []:
+        total += 1
+        if status != "completed":
+            pending += 1
+        elif conclusion in FAILED_CONCLUSIONS:
+            failed.append(name)
+
+    if failed:
+        return "failure", f"{len(failed)} of {total} checks failed: {', '.join(filter(None, failed))}"
+    if pending:
+        return "pending", f"{pending} of {total} checks still running."
+    return ("success", f"{total} checks passed.") if total else ("none", "No checks reported.")
+
+def probe_pr(session, link):
+    """
+    Resolve one pre-check PR link through the API and triage it.
+
+    Merged and closed PRs cost one request; open PRs also have their head
+    commit's statuses and check runs read, and are read again after
+    MERGEABLE_RETRY_SECONDS if GitHub has not computed their mergeability. All GETs go through cached_get(),
+    so unchanged PRs are answered with free 304s on the next run.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        link (str): Pre-check link from PRE_LINKS_FILE.
+
+    Returns:
+        list: [link, triage, state, mergeable, checks, reason] (PRECHECK_HEADERS)
+    """
+    try:
+        org, repo, number = parse_pr_link(link)
+    except ValueError:
+        return [link, "Unknown", "-", "-", "-", "Not a pull request link."]
+
+    try:
+        url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls/{number}"
+        status_code, pr = cached_get(session, url, extract_pull_state)
+        if status_code != 200:
+            return [link, "Unknown", "-", "-", "-", f"PR request failed: HTTP {status_code}."]
+
+        if pr["merged"]:
+            return [link, "Merged", "merged", "-", "-", ""]
+        if pr["state"] != "open":
+            return [link, "Closed", pr["state"], "-", "-", "Closed without merging."]
+
+        # ---- Mergeability not computed yet: the first read started it, ask once more
+        if pr["mergeable"] is None or pr["mergeable_state"] == "unknown":
+            time.sleep(MERGEABLE_RETRY_SECONDS)
+            status_code, repolled = cached_get(session, url, extract_pull_state)
+            if status_code == 200:
+                pr = repolled
+
+        # ---- Open PR: read the checks on its head commit
+        commit_url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/commits/{pr['sha']}"
+        _, statuses = cached_get(session, f"{commit_url}/status", extract_commit_status)
+        _, check_runs = cached_get(session, f"{commit_url}/check-runs", extract_check_runs, params={"per_page": 100})
+        checks, detail = summarize_checks(statuses, check_runs)
+
+        mergeable = pr["mergeable_state"]
+        if mergeable == "dirty" or pr["mergeable"] is False:
+            triage, detail = "Conflict", "Merge conflict with the base branch."
+        elif checks == "failure":
+            triage = "Checks failing"
+        elif pr["mergeable"] is None or mergeable == "unknown":
+            triage, detail = "Mergeability unknown", "GitHub has not finished checking for merge conflicts."
+        elif checks == "pending":
+            triage = "Checks pending"
+        elif mergeable == "blocked":
+            triage, detail = "Blocked", "Blocked by branch protection (e.g. review required)."
+        else:
+            triage = "Ready"
+        return [link, triage, "open", mergeable, checks, detail]
+
+    except Exception as e:
+        logging.exception(f"Error probing {link}:")
+        return [link, "Unknown", "-", "-", "-", str(e)]
+
+def probe_precheck_links(links):
+    """
+    Probe pre-check PR links concurrently with PROBE_WORKERS threads.
+
+    Args:
+        links (list[str]): Pre-check links.
+
+    Returns:
+        list[list]: One PRECHECK_HEADERS row per link, in input order.
+    """
+    def run(link):
+        return probe_pr(get_session(), link)
+
+    # The probe runs before any engine has sized the scheduler; admit one request per probe worker
+    rate_limiter.max_concurrency = PROBE_WORKERS
+
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as executor:
+        return list(executor.map(run, links))
+
+def save_precheck_report(rows):
+    """
+    Write the pre-check triage workbook under today's output directory.
+
+    Args:
+        rows (list[list]): Rows from probe_precheck_links().
+
+    Returns:
+        str|None: Path of the saved workbook, or None if it could not be written.
+    """
+    now = datetime.now()
+    report_dir = os.path.join(config.BASE_OUTPUT_DIR, now.strftime("%Y%m%d"))
+    path = os.path.join(report_dir, f"precheck_triage_{now.strftime('%Y%m%d_%H%M%S')}.xlsx")
+    try:
+        os.makedirs(report_dir, exist_ok=True)
+        write_results_workbook(rows, path, headers=PRECHECK_HEADERS, sheet_title="Pre-check Triage")
+    except OSError as e:
+        print(f"❌ Unable to save pre-check triage report: {e}")
+        return None
+    return path
+
+# -------------- Load Pre-check Links ------------------------
+def open_links_from_excel(path, probe=True):
+    """
+    Load pre-check links from a CSV or XLSX file and prompt the user to open them in Edge browser.
+
+    With probe on, every link is first triaged through the API
+    (probe_precheck_links()), a triage workbook is saved, and only links
+    whose triage is in PRECHECK_ATTENTION are offered for opening.
+
+    Args:
+        path (str): Path to the pre-check file (CSV or XLSX format).
+        probe (bool): Triage links through the API instead of opening all of them.
+    """
+    links = []
+    try:
+        # ---- Read from CSV file ----
+        if path.lower().endswith(".csv"):
+            with open(path, newline="", encoding="utf-8") as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header row if present
+                links = [row[0].strip() for row in reader if row and row[0].startswith("http")]
+
+        # ---- Read from Excel file (.xlsx) ----
+        else:
+            import openpyxl
+
+            wb = openpyxl.load_workbook(path, read_only=True)
+            try:
+                sheet = wb.active
+                links = [row[0].strip() for row in sheet.iter_rows(min_row=2, max_col=1, values_only=True)
+                         if row and row[0] and isinstance(row[0], str) and row[0].startswith("http")]
+            finally:
+                wb.close()
+
+        # ---- Handle empty or invalid file ----
+        if not links:
+            print("ℹ️ No valid links found in pre-check file.")
+            return
+
+        # ---- Triage through the API and keep only links that need a human look ----
+        found = f"{len(links)} pre-check links found"
+        if probe:
+            print(f"\n🔎 Probing {len(links)} pre-check links...")
+            rows = probe_precheck_links(links)
+            counts = {}
+            for row in rows:
+                counts[row[1]] = counts.get(row[1], 0) + 1
+            print("🔎 Triage: " + ", ".join(f"{count} {triage}" for triage, count in sorted(counts.items())))
+            logging.info(f"Pre-check triage: {counts}")
+            report = save_precheck_report(rows)
+            if report:
+                print(f"💾 Triage report saved to: {report}")
+
+            links = [row[0] for row in rows if row[1] in PRECHECK_ATTENTION]
+            if not links:
+                print("✅ No pre-check links need attention.")
+                return
+            found = f"{len(links)} of {len(rows)} pre-check links need attention"
+
+        # ---- Ask for user confirmation before opening ----
+        confirm = input(f"\n📘 {found}. Open in Edge? (y/n): ").strip().lower()
+        if confirm == "y":
+            open_links_in_edge_window_grouped(links, group_size=15)
+        else:
+            print()
+            print("❌ Skipped opening pre-check links.")
+
+    except Exception as e:
+        # ---- Error handling during file reading ----
+        print()
+        print(f"❌ Failed to open links from file: {e}")
+
+# -------------- Open PR Links in Browser --------------------
+def open_pr_links_in_browser(results):
+    """
+    Extract successfully created or duplicate PR links from results and open them in Edge.
+
+    Args:
+        results (list[ResultRow]): PR processing results.
+    """
+    # Filter out links where the PR was successfully created or already existed
+    pr_links = [
+        row.pr_link
+        for row in results
+        if row.status in (ResultStatus.CREATED, ResultStatus.DUPLICATE) and row.pr_link
+    ]
+
+    # If no links to open, notify user and return
+    if not pr_links:
+        print("\nℹ️ No PR links to open.")
+        return
+
+    # Ask for confirmation before opening links in browser
+    confirm = input(f"\n🔗 {len(pr_links)} PR links found. Open in Edge? (y/n): ").strip().lower()
+    if confirm == "y":
+        open_links_in_edge_window_grouped(pr_links, group_size=7)
+    else:
+        print()
+        print("❌ Skipped opening PR links.")
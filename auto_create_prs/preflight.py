@@ -0,0 +1,131 @@
+"""GraphQL pre-flight: one query per batch of links finds branches that are already merged or missing."""
+
+import json
+import logging
+
+from . import config
+from .api import github_request
+from .links import parse_compare_link
+from .pulls import pr_index
+from .results import ResultRow, ResultStatus
+from .session import get_session
+
+
+# -------------- GraphQL Pre-flight ----------------------------
+# Compare links resolved per GraphQL query
+PREFLIGHT_BATCH_SIZE = 50
+
+
+def build_preflight_query(batch):
+    """
+    Build one GraphQL query covering a batch of parsed compare links.
+
+    Links are grouped under one `repository` field per repo. For each link
+    the query asks for the commits head is ahead of base, whether the head
+    branch exists, and any open PR between them.
+
+    Args:
+        batch (list[tuple]): (index, org, repo, base, head) tuples.
+
+    Returns:
+        str: GraphQL query document with aliases r{n} per repo and l{index} per link.
+    """
+    by_repo = {}
+    for index, org, repo, base, head in batch:
+        by_repo.setdefault((org, repo), []).append((index, base, head))
+
+    # json.dumps produces valid GraphQL string literals
+    repo_fields = []
+    for repo_num, ((org, repo), links) in enumerate(by_repo.items()):
+        link_fields = []
+        for index, base, head in links:
+            link_fields.append(
+                f"l{index}_base: ref(qualifiedName: {json.dumps('refs/heads/' + base)}) "
+                f"{{ compare(headRef: {json.dumps(head)}) {{ aheadBy }} }} "
+                f"l{index}_head: ref(qualifiedName: {json.dumps('refs/heads/' + head)}) {{ id }} "
+                f"l{index}_prs: pullRequests(states: OPEN, baseRefName: {json.dumps(base)}, "
+                f"headRefName: {json.dumps(head)}, first: 1) {{ nodes {{ url }} }}"
+            )
+        repo_fields.append(
+            f"r{repo_num}: repository(owner: {json.dumps(org)}, name: {json.dumps(repo)}) "
+            f"{{ {' '.join(link_fields)} }}"
+        )
+
+    return f"query {{ {' '.join(repo_fields)} }}"
+
+
+def preflight_links(compare_links):
+    """
+    Resolve compare links in bulk through the GitHub GraphQL API before any REST calls.
+
+    Links whose outcome is already certain are finished here:
+    - Skipped: both branches exist and head has no commits ahead of base.
+    - Duplicate: an open PR between base and head already exists.
+
+    Every other link (needs a PR, unparseable, missing or non-branch refs,
+    failed queries) is returned for the normal processing path, which stays
+    the authority on errors.
+
+    Args:
+        compare_links (list[str]): List of GitHub compare URLs.
+
+    Returns:
+        resolved (list[ResultRow]): Result rows for links finished during pre-flight.
+        remaining (list[str]): Links that still need process_link().
+    """
+    session = get_session()
+    parsed = []
+    remaining_idx = set()
+
+    for index, link in enumerate(compare_links):
+        try:
+            parsed.append((index, *parse_compare_link(link)))
+        except ValueError:
+            remaining_idx.add(index)  # Reported as an error by process_link
+
+    resolved = []
+    for start in range(0, len(parsed), PREFLIGHT_BATCH_SIZE):
+        batch = parsed[start:start + PREFLIGHT_BATCH_SIZE]
+        query = build_preflight_query(batch)
+        response = github_request(
+            session, "POST", f"{config.GITHUB_API_URL}/graphql", retry=True, json={"query": query}
+        )
+
+        # ---- On failure, leave the whole batch to the REST path
+        data = response.json().get("data") if response.status_code == 200 else None
+        if not data:
+            logging.warning(f"GraphQL pre-flight failed with status {response.status_code}")
+            remaining_idx.update(index for index, *_ in batch)
+            continue
+
+        repos = {}
+        for value in data.values():
+            if value:
+                repos.update(value)
+
+        for index, org, repo, base, head in batch:
+            link = compare_links[index]
+            base_ref = repos.get(f"l{index}_base")
+            head_ref = repos.get(f"l{index}_head")
+            prs = (repos.get(f"l{index}_prs") or {}).get("nodes") or []
+            comparison = (base_ref or {}).get("compare")
+
+            # ---- Refs not resolvable as branches: let the REST path decide
+            if not comparison or not head_ref:
+                remaining_idx.add(index)
+                continue
+
+            ahead_by = comparison["aheadBy"]
+            if ahead_by == 0:
+                resolved.append(ResultRow(link, ResultStatus.SKIPPED, commits=0, reason="No new commits to publish."))
+            elif prs:
+                pr_index.add(org, repo, base, head, prs[0]["url"])
+                resolved.append(ResultRow(
+                    link, ResultStatus.DUPLICATE, prs[0]["url"], ahead_by, reason="Pull request already exists."
+                ))
+            else:
+                remaining_idx.add(index)
+
+    remaining = [link for index, link in enumerate(compare_links) if index in remaining_idx]
+    logging.info(f"Pre-flight resolved {len(resolved)} links; {len(remaining)} need processing")
+    return resolved, remaining
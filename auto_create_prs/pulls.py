@@ -0,0 +1,529 @@
+"""Find and create pull requests: open-PR index, duplicate lookups and the idempotent create POST."""
+
+import asyncio
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+
+from . import config
+from .api import github_request, github_request_async
+from .cache import cached_get, cached_get_async
+from .results import ResultStatus
+from .retry import RETRY_MAX_ATTEMPTS, RETRY_STATUSES, retry_policy
+from .run_metrics import metrics
+from .session import load_aiohttp
+
+
+# --------------------- Open PR Index -------------------------
+# Page size used when listing a repository's open pull requests
+PULLS_PER_PAGE = 100
+
+
+class OpenPRIndex:
+    """
+    Per-run, thread-safe index of open pull requests.
+
+    Maps (org, repo) → {(base, head): html_url}. Each repository is listed
+    at most once (with full pagination), and PRs created during the run are
+    added as they are created, so duplicate lookups are O(1).
+    """
+
+    def __init__(self):
+        self._repos = {}
+        self._loaded = set()
+        self._lock = threading.Lock()
+        self._repo_locks = {}
+        self._async_locks = {}
+
+    @staticmethod
+    def _key(org, repo):
+        # GitHub treats owner and repository names case-insensitively
+        return org.lower(), repo.lower()
+
+    def repo_lock(self, org, repo):
+        """Return the lock that serializes loading of one repository."""
+        with self._lock:
+            return self._repo_locks.setdefault(self._key(org, repo), threading.Lock())
+
+    def repo_lock_async(self, org, repo):
+        """Return the asyncio lock that serializes loading of one repository."""
+        with self._lock:
+            return self._async_locks.setdefault(self._key(org, repo), asyncio.Lock())
+
+    def reset_async_locks(self):
+        """Drop asyncio locks bound to a previous event loop."""
+        with self._lock:
+            self._async_locks = {}
+
+    def is_loaded(self, org, repo):
+        """Return True if the repository's open PRs are already indexed."""
+        with self._lock:
+            return self._key(org, repo) in self._loaded
+
+    def load(self, org, repo, pulls):
+        """
+        Index a repository from its complete list of open pull requests.
+
+        Args:
+            org (str): GitHub organization or username.
+            repo (str): Repository name.
+            pulls (list[dict]): JSON payloads from the GitHub pulls endpoint.
+        """
+        entries = {
+            (pr.get("base", {}).get("ref"), pr.get("head", {}).get("ref")): pr.get("html_url")
+            for pr in pulls
+        }
+        with self._lock:
+            # Keep PRs added while the listing was in flight
+            entries.update(self._repos.get(self._key(org, repo), {}))
+            self._repos[self._key(org, repo)] = entries
+            self._loaded.add(self._key(org, repo))
+
+    def add(self, org, repo, base, head, html_url):
+        """Record a pull request created (or found) during this run."""
+        with self._lock:
+            self._repos.setdefault(self._key(org, repo), {})[(base, head)] = html_url
+
+    def get(self, org, repo, base, head):
+        """Return the indexed PR URL for base/head, or None."""
+        with self._lock:
+            return self._repos.get(self._key(org, repo), {}).get((base, head))
+
+    def clear(self):
+        """Forget every indexed repository so the next lookup lists it again."""
+        with self._lock:
+            self._repos = {}
+            self._loaded = set()
+
+
+# Shared by every link in the run
+pr_index = OpenPRIndex()
+
+# --------------------- Check Existing PRs ---------------------
+def slim_pulls(pulls):
+    """Keep only the fields duplicate detection needs from a pulls listing."""
+    return [
+        {
+            "base": {"ref": pr.get("base", {}).get("ref")},
+            "head": {"ref": pr.get("head", {}).get("ref")},
+            "html_url": pr.get("html_url"),
+            "created_at": pr.get("created_at"),
+        }
+        for pr in pulls
+    ]
+
+def extract_pulls(response):
+    """cached_get() extractor for the pulls endpoint."""
+    return slim_pulls(response.json()) if response.status_code == 200 else None
+
+def fetch_open_pulls(session, org, repo):
+    """
+    List every open pull request in a repository, following pagination.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        org (str): GitHub organization or username.
+        repo (str): Repository name.
+
+    Returns:
+        list[dict] or None: All open PRs, or None if a page could not be fetched.
+    """
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    pulls = []
+    page = 1
+
+    while True:
+        params = {"state": "open", "per_page": PULLS_PER_PAGE, "page": page}
+        status_code, batch = cached_get(session, url, extract_pulls, params=params)
+        if status_code != 200:
+            logging.warning(f"GitHub PR check failed with status {status_code} for {org}/{repo}")
+            return None
+
+        pulls.extend(batch)
+
+        # A short page means this was the last one
+        if len(batch) < PULLS_PER_PAGE:
+            return pulls
+        page += 1
+
+
+# Check if a pull request already exists between the specified base and head branches
+def check_existing_pr(session, org, repo, base, head):
+    """
+    Check if a pull request already exists between base and head branches.
+
+    The repository's open PRs are listed once per run into pr_index; later
+    lookups for the same repository are answered from the index. On an index
+    miss, a single server-side filtered query catches PRs opened elsewhere
+    after the listing.
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        org (str): GitHub organization or username.
+        repo (str): Repository name.
+        base (str): Base branch name (e.g., main).
+        head (str): Head branch name (e.g., feature/new-ui).
+
+    Returns:
+        str or None: URL of the existing pull request if found; otherwise None.
+    """
+    # ---- Fill the index for this repository once, even with many concurrent lookups
+    with pr_index.repo_lock(org, repo):
+        if not pr_index.is_loaded(org, repo):
+            pulls = fetch_open_pulls(session, org, repo)
+            if pulls is not None:
+                pr_index.load(org, repo, pulls)
+
+    pr_url = pr_index.get(org, repo, base, head)
+    if pr_url:
+        return pr_url
+
+    # ---- Index miss: ask GitHub directly for this exact base/head pair
+    pr = fetch_matching_pull(session, org, repo, base, head)
+    return pr["html_url"] if pr else None
+
+def fetch_matching_pull(session, org, repo, base, head):
+    """
+    Ask GitHub for the open pull request from head into base (filtered server-side).
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        org (str): GitHub organization or username.
+        repo (str): Repository name.
+        base (str): Base branch name.
+        head (str): Head branch name.
+
+    Returns:
+        dict or None: The matching PR (html_url, created_at, ...) if open; otherwise None.
+    """
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    params = {"state": "open", "head": f"{org}:{head}", "base": base}
+    status_code, pulls = cached_get(session, url, extract_pulls, params=params)
+    if status_code != 200:
+        logging.warning(f"GitHub PR check failed with status {status_code} for {org}/{repo}")
+        return None
+
+    pr = find_matching_pull(pulls, base, head)
+    if pr:
+        pr_index.add(org, repo, base, head, pr["html_url"])
+    return pr
+
+def find_matching_pull(pulls, base, head):
+    """
+    Find the pull request in a GitHub pulls listing that matches base and head.
+
+    Args:
+        pulls (list[dict]): JSON payload from the GitHub pulls endpoint.
+        base (str): Base branch name.
+        head (str): Head branch name.
+
+    Returns:
+        dict or None: The matching pull request if found; otherwise None.
+    """
+    # Check each open PR to see if it matches the base and head
+    for pr in pulls:
+        if pr.get("base", {}).get("ref") == base and pr.get("head", {}).get("ref") == head:
+            return pr  # Matching PR found
+
+    return None  # No matching PR found
+
+# --------------------- Idempotency Guard -----------------------
+# Clock difference tolerated between this machine and GitHub when dating a PR
+# found after a failed create attempt
+CREATE_CLOCK_SKEW = 30
+
+
+def parse_github_time(value):
+    """Parse a GitHub timestamp ("2025-06-09T17:30:45Z") to epoch seconds, or None."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+def guarded_result(pr, known_before, first_attempt):
+    """
+    Classify an open PR found by the idempotency guard after a failed create attempt.
+
+    The PR only counts as Created when it was not in the index before the
+    first attempt and GitHub dates it after that attempt started (within
+    CREATE_CLOCK_SKEW). Otherwise it existed before this run tried to create
+    it, and the link is a Duplicate.
+
+    Args:
+        pr (dict): Matching PR from fetch_matching_pull().
+        known_before (str|None): pr_index entry for base/head before the first attempt.
+        first_attempt (float): Epoch time the first create attempt started.
+
+    Returns:
+        tuple: (status, pr_link, reason), as create_pull_request() returns.
+    """
+    created_at = parse_github_time(pr.get("created_at"))
+    if known_before or created_at is None or created_at < first_attempt - CREATE_CLOCK_SKEW:
+        return ResultStatus.DUPLICATE, pr["html_url"], "Pull request already exists."
+    return ResultStatus.CREATED, pr["html_url"], "PR found after a failed attempt."
+
+# --------------------- Create Pull Request ---------------------
+# Attempt to create a pull request on GitHub, with retry and error handling
+def create_retry_delay(attempt, max_retries, cause, retry_after=None):
+    """
+    Backoff before resending a create-PR POST, shared by both engines.
+
+    Args:
+        attempt (int): Zero-based attempt that just failed.
+        max_retries (int): Max attempts for the POST.
+        cause (str): What went wrong, for the log line.
+        retry_after (str|None): The response's Retry-After header, if any.
+
+    Returns:
+        float|None: Seconds to wait, or None once retries are exhausted.
+    """
+    if not (attempt + 1 < max_retries and retry_policy.should_retry(attempt)):
+        return None
+    delay = retry_policy.backoff(attempt, retry_after)
+    logging.warning(f"{cause} on attempt {attempt + 1}. Retrying in {delay:.1f}s...")
+    metrics.count("create_pull_retries")
+    return delay
+
+
+def create_outcome(status_code, attempt, max_retries, retry_after=None):
+    """
+    Classify a create-PR response for create_pull_request() and its async twin.
+
+    Returns:
+        tuple: (outcome, detail), one of
+            - ("created", None): 201, the body holds the new PR
+            - ("exists", None): 422, the PR must be looked up
+            - ("retry", delay): transient server error, retry after delay seconds
+            - ("error", reason): terminal error with a readable reason
+    """
+    # ---- PR successfully created
+    if status_code == 201:
+        return "created", None
+
+    # ---- PR already exists (422 Unprocessable Entity)
+    if status_code == 422:
+        return "exists", None
+
+    # ---- Temporary server error, back off and retry
+    if status_code in RETRY_STATUSES:
+        delay = create_retry_delay(attempt, max_retries, f"Server error ({status_code})", retry_after)
+        if delay is None:
+            return "error", "Failed after max retries due to server error."
+        return "retry", delay
+
+    # ---- Any other status is a terminal error
+    return "error", pr_error_reason(status_code)
+
+
+def duplicate_result(pr_url):
+    """Result for a create-PR POST rejected because the PR already exists."""
+    return (
+        ResultStatus.DUPLICATE,
+        pr_url,
+        "Pull request already exists." if pr_url else "PR exists but URL not found.",
+    )
+
+
+def create_pull_request(session, org, repo, base, head, title, max_retries=RETRY_MAX_ATTEMPTS):
+    """
+    Create a new pull request via GitHub API, with retry logic and detailed error handling.
+
+    The POST is not idempotent: a 5xx or dropped connection may still have
+    created the PR. Before every retry GitHub is asked for an open PR from
+    head into base; if there is one, it is reported instead of posting again,
+    as Created only if this run's attempt made it (see guarded_result()).
+
+    Args:
+        session (requests.Session): Authenticated GitHub session.
+        org (str): GitHub organization name.
+        repo (str): Repository name.
+        base (str): Base branch name (e.g., main).
+        head (str): Head branch name (e.g., feature).
+        title (str): Pull request title.
+        max_retries (int): Max attempts for transient server errors.
+
+    Returns:
+        tuple: (status, pr_link, reason)
+            - status: ResultStatus.CREATED, DUPLICATE or ERROR
+            - pr_link: URL to the created PR, or None if not available
+            - reason: Reason string for failure or duplication
+    """
+    from requests.exceptions import RequestException
+
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    data = {"title": title, "head": head, "base": base}
+    attempt = 0
+    known_before = pr_index.get(org, repo, base, head)
+    first_attempt = time.time()
+
+    while True:
+        # ---- Idempotency guard: an earlier failed attempt may have created the PR
+        if attempt:
+            pr = fetch_matching_pull(session, org, repo, base, head)
+            if pr:
+                return guarded_result(pr, known_before, first_attempt)
+
+        try:
+            response = github_request(session, "POST", url, retry=False, json=data)
+        except RequestException as e:
+            delay = create_retry_delay(attempt, max_retries, f"Create PR request failed ({e})")
+            if delay is None:
+                raise
+            attempt += 1
+            time.sleep(delay)
+            continue
+
+        outcome, detail = create_outcome(response.status_code, attempt, max_retries, response.headers.get("Retry-After"))
+        if outcome == "created":
+            pr_url = response.json()["html_url"]
+            pr_index.add(org, repo, base, head, pr_url)
+            return ResultStatus.CREATED, pr_url, ""
+        if outcome == "exists":
+            return duplicate_result(check_existing_pr(session, org, repo, base, head))
+        if outcome == "retry":
+            attempt += 1
+            time.sleep(detail)
+            continue
+        return ResultStatus.ERROR, None, detail
+
+
+def pr_error_reason(status_code):
+    """
+    Map a terminal HTTP status from the create-PR endpoint to a readable reason.
+
+    Args:
+        status_code (int): HTTP status code returned by GitHub.
+
+    Returns:
+        str: Reason string for the Excel report.
+    """
+    # ---- Not found (likely invalid repo or branch)
+    if status_code == 404:
+        return "Repository or branch not found."
+
+    # ---- Forbidden (rate limited or permission issue)
+    if status_code == 403:
+        return "Rate limit exceeded or token permissions insufficient."
+
+    # ---- Unauthorized (token expired or invalid)
+    if status_code == 401:
+        return "Invalid GitHub token."
+
+    # ---- Other unexpected error
+    return f"Unexpected error: {status_code}"
+
+
+def extract_pulls_async(status, payload):
+    """cached_get_async() extractor for the pulls endpoint."""
+    return slim_pulls(payload) if status == 200 else None
+
+
+async def fetch_open_pulls_async(session, org, repo):
+    """Asyncio counterpart of fetch_open_pulls()."""
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    pulls = []
+    page = 1
+
+    while True:
+        params = {"state": "open", "per_page": PULLS_PER_PAGE, "page": page}
+        status, batch = await cached_get_async(session, url, extract_pulls_async, params=params)
+        if status != 200:
+            logging.warning(f"GitHub PR check failed with status {status} for {org}/{repo}")
+            return None
+
+        pulls.extend(batch)
+
+        # A short page means this was the last one
+        if len(batch) < PULLS_PER_PAGE:
+            return pulls
+        page += 1
+
+
+async def check_existing_pr_async(session, org, repo, base, head):
+    """
+    Asyncio counterpart of check_existing_pr().
+
+    Args:
+        session (aiohttp.ClientSession): Authenticated GitHub session.
+        org (str): GitHub organization or username.
+        repo (str): Repository name.
+        base (str): Base branch name.
+        head (str): Head branch name.
+
+    Returns:
+        str or None: URL of the existing pull request if found; otherwise None.
+    """
+    # ---- Fill the index for this repository once, even with many concurrent lookups
+    async with pr_index.repo_lock_async(org, repo):
+        if not pr_index.is_loaded(org, repo):
+            pulls = await fetch_open_pulls_async(session, org, repo)
+            if pulls is not None:
+                pr_index.load(org, repo, pulls)
+
+    pr_url = pr_index.get(org, repo, base, head)
+    if pr_url:
+        return pr_url
+
+    # ---- Index miss: ask GitHub directly for this exact base/head pair
+    pr = await fetch_matching_pull_async(session, org, repo, base, head)
+    return pr["html_url"] if pr else None
+
+
+async def fetch_matching_pull_async(session, org, repo, base, head):
+    """Asyncio counterpart of fetch_matching_pull()."""
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    params = {"state": "open", "head": f"{org}:{head}", "base": base}
+    status, pulls = await cached_get_async(session, url, extract_pulls_async, params=params)
+    if status != 200:
+        logging.warning(f"GitHub PR check failed with status {status} for {org}/{repo}")
+        return None
+
+    pr = find_matching_pull(pulls, base, head)
+    if pr:
+        pr_index.add(org, repo, base, head, pr["html_url"])
+    return pr
+
+
+async def create_pull_request_async(session, org, repo, base, head, title, max_retries=RETRY_MAX_ATTEMPTS):
+    """
+    Asyncio counterpart of create_pull_request(), with the same idempotency guard.
+
+    Returns:
+        tuple: (status, pr_link, reason), same as create_pull_request().
+    """
+    aiohttp = load_aiohttp()
+    url = f"{config.GITHUB_API_URL}/repos/{org}/{repo}/pulls"
+    data = {"title": title, "head": head, "base": base}
+    attempt = 0
+    known_before = pr_index.get(org, repo, base, head)
+    first_attempt = time.time()
+
+    while True:
+        # ---- Idempotency guard: an earlier failed attempt may have created the PR
+        if attempt:
+            pr = await fetch_matching_pull_async(session, org, repo, base, head)
+            if pr:
+                return guarded_result(pr, known_before, first_attempt)
+
+        try:
+            status_code, payload, headers = await github_request_async(session, "POST", url, retry=False, json=data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            delay = create_retry_delay(attempt, max_retries, f"Create PR request failed ({e!r})")
+            if delay is None:
+                raise
+            attempt += 1
+            await asyncio.sleep(delay)
+            continue
+
+        outcome, detail = create_outcome(status_code, attempt, max_retries, headers.get("Retry-After"))
+        if outcome == "created":
+            pr_index.add(org, repo, base, head, payload["html_url"])
+            return ResultStatus.CREATED, payload["html_url"], ""
+        if outcome == "exists":
+            return duplicate_result(await check_existing_pr_async(session, org, repo, base, head))
+        if outcome == "retry":
+            attempt += 1
+            await asyncio.sleep(detail)
+            continue
+        return ResultStatus.ERROR, None, detail
@@ -0,0 +1,138 @@
+"""Scheduler that keeps requests within GitHub's primary and secondary rate limits."""
+
+import asyncio
+import time
+import logging
+import threading
+
+from . import config
+from .retry import retry_after_seconds
+from .tokens import token_pool
+
+
+# --------------------- Rate-Limit Scheduler -------------------
+# Pause applied to a secondary rate limit that carries no Retry-After header
+SECONDARY_LIMIT_PAUSE = 60
+
+# How many times one request may be parked on a rate limit before giving up
+MAX_RATE_LIMIT_PARKS = 5
+
+
+class RateLimitScheduler:
+    """
+    Central gate for every GitHub API request in a run.
+
+    - Tracks the remaining request budget of the token pool (from X-RateLimit-* headers).
+    - Lowers the number of requests allowed in flight as the budget drains.
+    - Pauses all requests until the reset time when a primary or secondary
+      rate limit is hit, so limited requests are parked and requeued
+      instead of being reported as errors.
+
+    Safe to share between worker threads and the asyncio engine.
+    """
+
+    def __init__(self, max_concurrency):
+        self.max_concurrency = max_concurrency
+        self.limit = None
+        self.remaining = None
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.parked = 0
+        self._cond = threading.Condition()
+
+    def allowed_concurrency(self):
+        """Return how many requests may be in flight given the remaining budget."""
+        if self.remaining is None or not self.limit:
+            return self.max_concurrency
+
+        # Full concurrency while at least half the budget is left, then scale down to 1
+        fraction = self.remaining / self.limit
+        if fraction >= 0.5:
+            return self.max_concurrency
+        return max(1, int(self.max_concurrency * fraction * 2))
+
+    def _try_acquire(self):
+        """Claim a request slot. Returns 0 on success, else seconds to wait (caller holds the lock)."""
+        wait = self.paused_until - time.time()
+        if wait > 0:
+            return wait
+        if self.in_flight >= self.allowed_concurrency():
+            return 0.05
+        self.in_flight += 1
+        return 0
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent."""
+        with self._cond:
+            while True:
+                wait = self._try_acquire()
+                if wait == 0:
+                    return
+                self._cond.wait(timeout=wait)
+
+    async def acquire_async(self):
+        """Wait on the event loop, without blocking it, until a request may be sent."""
+        while True:
+            with self._cond:
+                wait = self._try_acquire()
+            if wait == 0:
+                return
+            await asyncio.sleep(wait)
+
+    def release(self, status_code, headers, secondary=False):
+        """
+        Free the request slot and learn from the response headers.
+
+        Args:
+            status_code (int): HTTP status of the response.
+            headers (Mapping): Response headers.
+            secondary (bool): True if the response body reports a secondary rate limit.
+
+        Returns:
+            float: Seconds the request must be parked before it is retried,
+            or 0 if the response was not rate limited.
+        """
+        with self._cond:
+            self.in_flight -= 1
+
+            # ---- Track remaining budget across all tokens (token_pool reads the headers)
+            remaining = headers.get("X-RateLimit-Remaining")
+            budget_remaining, budget_limit, reset = token_pool.budget()
+            if budget_remaining is not None:
+                self.remaining = budget_remaining
+                self.limit = budget_limit
+
+            # ---- Every token exhausted: pause everyone until the first window resets
+            pause_until = 0.0
+            if reset is not None:
+                pause_until = reset
+
+            park = 0.0
+            if status_code in (403, 429):
+                retry_after = retry_after_seconds(headers.get("Retry-After"))
+                if retry_after is not None:
+                    # Secondary rate limit with an explicit back-off (seconds or HTTP date)
+                    pause_until = max(pause_until, time.time() + retry_after)
+                elif remaining == "0" and reset is not None:
+                    # Primary rate limit
+                    pause_until = max(pause_until, float(reset))
+                elif status_code == 429 or secondary:
+                    # Secondary rate limit without guidance
+                    pause_until = max(pause_until, time.time() + SECONDARY_LIMIT_PAUSE)
+
+                if pause_until > time.time():
+                    park = pause_until - time.time()
+                    self.parked += 1
+
+            if pause_until > self.paused_until:
+                self.paused_until = pause_until
+                logging.warning(
+                    f"Rate limit reached; pausing requests for {max(0.0, pause_until - time.time()):.0f}s"
+                )
+
+            self._cond.notify_all()
+            return park
+
+
+# Shared by every request in the process
+rate_limiter = RateLimitScheduler(config.MAX_WORKERS)
@@ -0,0 +1,256 @@
+"""Result rows of a run and the Excel workbooks they are saved to."""
+
+import os
+import logging
+from enum import Enum
+from typing import NamedTuple, Optional
+
+from .links import parse_compare_link
+
+
+# --------------------- Result Records --------------------------
+class ResultStatus(str, Enum):
+    """Outcome of one compare link. Members compare and hash equal to their plain strings."""
+
+    CREATED = "Created"
+    SKIPPED = "Skipped"
+    DUPLICATE = "Duplicate"
+    ERROR = "Error"
+
+    def __str__(self):
+        return self.value
+
+
+class TruncatedCount(int):
+    """A count GitHub cut off at its value: it sums as the number and prints as e.g. "300+"."""
+
+    __slots__ = ()
+
+    def __str__(self):
+        return f"{int(self)}+"
+
+
+# GitHub lists at most 300 changed files per compare; a full list means there may be more
+FILES_TRUNCATED = TruncatedCount(300)
+
+
+class ResultRow(NamedTuple):
+    """
+    Result of one compare link.
+
+    A tuple subclass: rows carry no per-instance __dict__ and still index and
+    unpack in column order. Missing values are None and counts stay numeric;
+    "-" and "300+" only appear when a row is written out (format_cell()).
+    """
+
+    link: str
+    status: ResultStatus
+    pr_link: Optional[str] = None
+    commits: Optional[int] = None
+    files_changed: Optional[int] = None  # FILES_TRUNCATED when GitHub truncated the list
+    reason: str = ""
+
+    def to_record(self):
+        """JSON-ready dict for the journal and the shard queue."""
+        record = self._asdict()
+        record["status"] = self.status.value
+        if isinstance(self.files_changed, TruncatedCount):
+            record["files_changed"] = str(self.files_changed)
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Rebuild a row from to_record() output, also accepting the older "-"/"300+" text cells."""
+        pr_link = record.get("pr_link")
+        return cls(
+            link=record["link"],
+            status=ResultStatus(record["status"]),
+            pr_link=pr_link if pr_link not in (None, "", "-") else None,
+            commits=parse_count(record.get("commits")),
+            files_changed=parse_count(record.get("files_changed")),
+            reason=record.get("reason") or "",
+        )
+
+
+RESULT_FIELDS = list(ResultRow._fields)
+
+
+def parse_count(value):
+    """Parse a stored count: None/"-" → None, "300+" → TruncatedCount, digits → int."""
+    if value is None or isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if value.endswith("+") and value[:-1].isdigit():
+        return TruncatedCount(int(value[:-1]))
+    return int(value) if value.isdigit() else None
+
+
+def format_cell(value):
+    """Render one value for a workbook cell: None → "-", enums and truncated counts → text."""
+    if value is None:
+        return "-"
+    if isinstance(value, (ResultStatus, TruncatedCount)):
+        return str(value)
+    return value
+
+
+def new_stats():
+    """Fresh outcome counters, one per ResultStatus."""
+    return {status.value: 0 for status in ResultStatus}
+
+# ---------------- Save PR Results to Excel ------------------
+RESULT_HEADERS = ["Compare Link", "Result", "PR Link", "Commits", "Files Changed", "Reason"]
+
+REPO_SUMMARY_HEADERS = ["Org", "Repo", "Links", "Created", "Skipped", "Duplicate", "Error", "Commits", "Files Changed"]
+
+
+def summarize_by_repo(results):
+    """
+    Aggregate result rows per repository in a single pass.
+
+    Args:
+        results (list[ResultRow]): Result rows of the run.
+
+    Returns:
+        list[list]: One row per (org, repo) in REPO_SUMMARY_HEADERS order, sorted
+        by org and repo. Files Changed is a TruncatedCount (shown as "N+") when
+        any compare in the repository hit the 300-file limit.
+    """
+    status_column = {status: 3 + idx for idx, status in enumerate(ResultStatus)}
+    repos = {}
+    for row in results:
+        try:
+            org, repo, _, _ = parse_compare_link(row.link)
+        except ValueError:
+            org, repo = "(invalid link)", "-"
+
+        # Org/repo names are case-insensitive on GitHub
+        key = (org.lower(), repo.lower())
+        totals = repos.get(key)
+        if totals is None:
+            totals = repos[key] = [org, repo, 0, 0, 0, 0, 0, 0, 0, False]
+        totals[2] += 1
+        totals[status_column[row.status]] += 1
+        totals[7] += row.commits or 0
+        totals[8] += row.files_changed or 0
+        totals[9] = totals[9] or isinstance(row.files_changed, TruncatedCount)
+
+    summary = []
+    for key in sorted(repos):
+        *cells, truncated = repos[key]
+        if truncated:
+            cells[8] = TruncatedCount(cells[8])
+        summary.append(cells)
+    return summary
+
+def api_calls_saved(plan, results):
+    """
+    Count the API calls the plan's de-duplication avoided.
+
+    Every dropped duplicate of a valid link saves its compare GET; if the
+    link needed a PR, it also saves the create POST that would have raced
+    the first one into a 422.
+
+    Args:
+        plan (dict): Report from plan_links().
+        results (list[ResultRow]): Result rows of the run.
+
+    Returns:
+        int: API calls saved.
+    """
+    status_by_link = {row.link: row.status for row in results}
+    saved = 0
+    for link, extra in plan["repeats"].items():
+        calls = 2 if status_by_link.get(link) in (ResultStatus.CREATED, ResultStatus.DUPLICATE) else 1
+        saved += extra * calls
+    return saved
+
+
+def write_results_workbook(results, output_path, headers=RESULT_HEADERS, sheet_title="PR Results", extra_sheets=()):
+    """
+    Stream the results into a write-only workbook and save it.
+
+    Column widths are computed in a single pass over the row values, since
+    write-only sheets must declare widths before the first row is written.
+    Rows are then streamed to disk, so memory stays flat regardless of row count.
+    Values are rendered with format_cell(): None as "-", truncated counts as "300+".
+
+    Args:
+        results (list): Rows of the first sheet (ResultRow or plain lists).
+        output_path (str): Path to the output Excel file.
+        headers (list[str]): Header row; defaults to the PR result columns.
+        sheet_title (str): Name of the worksheet.
+        extra_sheets (iterable): (sheet_title, headers, rows) for further worksheets.
+    """
+    import openpyxl
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = openpyxl.Workbook(write_only=True)
+
+    # Set font styles
+    header_font = Font(name="Segoe UI", size=11, bold=True)
+    cell_font = Font(name="Segoe UI", size=11)
+
+    for title, sheet_headers, rows in [(sheet_title, headers, results), *extra_sheets]:
+        ws = wb.create_sheet(title)
+
+        # Size each column to its longest value (header included)
+        widths = [len(header) for header in sheet_headers]
+        for row in rows:
+            for idx, value in enumerate(row):
+                widths[idx] = max(widths[idx], len(str(format_cell(value))))
+        for idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(idx)].width = width + 2
+
+        # The workbook interns fonts, so every cell shares one style record per font
+        def styled(values, font):
+            cells = []
+            for value in values:
+                cell = WriteOnlyCell(ws, value=format_cell(value))
+                cell.font = font
+                cells.append(cell)
+            return cells
+
+        # Write header and data rows
+        ws.append(styled(sheet_headers, header_font))
+        for row in rows:
+            ws.append(styled(row, cell_font))
+
+    wb.save(output_path)
+
+def save_results_to_excel(results, output_path, open_file=True):
+    """
+    Save the PR creation results to an Excel file with headers, auto column sizing, and font formatting.
+
+    A second "Repo Summary" sheet totals the outcomes, commits and changed
+    files of each repository (see summarize_by_repo()).
+
+    Args:
+        results (list[ResultRow]): PR creation results.
+        output_path (str): Path to the output Excel file.
+        open_file (bool): Open the saved file in the default viewer (off in batch mode).
+
+    Returns:
+        str: Path the workbook was actually saved to.
+    """
+    extra_sheets = [("Repo Summary", REPO_SUMMARY_HEADERS, summarize_by_repo(results))]
+
+    # Save workbook with fallback handling if the file is open
+    try:
+        write_results_workbook(results, output_path, extra_sheets=extra_sheets)
+    except PermissionError:
+        fallback = os.path.splitext(output_path)[0] + "_retry.xlsx"
+        print()
+        print(f"❌ Unable to save to {output_path}. File might be open. Saving as: {fallback}")
+        write_results_workbook(results, fallback, extra_sheets=extra_sheets)
+        output_path = fallback
+
+    # Automatically open the file in the default Excel viewer
+    if open_file:
+        import webbrowser
+
+        webbrowser.open(output_path)
+    logging.info(f"Results saved to: {output_path}")
+    return output_path
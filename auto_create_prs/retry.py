@@ -0,0 +1,128 @@
+"""Retry policy for transient GitHub failures: exponential backoff with jitter and a retry budget."""
+
+import random
+import time
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+from .run_metrics import metrics
+
+
+# --------------------- Retry Policy ---------------------------
+# Responses treated as transient server errors
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Attempts per request (first try included), and backoff bounds in seconds
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Retry budget: at most RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO × requests sent per run
+RETRY_BUDGET_MIN = 10
+RETRY_BUDGET_RATIO = 0.1
+
+
+def retry_after_seconds(retry_after):
+    """
+    Parse a Retry-After header value.
+
+    Args:
+        retry_after (str|None): Delay in seconds or an HTTP date.
+
+    Returns:
+        float|None: Seconds to wait from now (never negative), or None if the
+        value is missing or unparseable.
+    """
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(retry_after)
+        return max(0.0, when.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    One retry policy shared by every GitHub call in a run.
+
+    - Exponential backoff with full jitter: sleep uniform(0, min(cap, base × 2^attempt)),
+      so workers that failed together do not retry in lockstep.
+    - A Retry-After header, when present, overrides the computed delay.
+    - A per-run retry budget stops a large batch from amplifying an outage:
+      once retries exceed RETRY_BUDGET_MIN + RETRY_BUDGET_RATIO × requests,
+      failures are returned to the caller instead of being retried.
+    """
+
+    def __init__(self, max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, budget_min=RETRY_BUDGET_MIN, budget_ratio=RETRY_BUDGET_RATIO):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_min = budget_min
+        self.budget_ratio = budget_ratio
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start a new budget, e.g. for the next file in watch mode; the shared instance stays the same."""
+        with self._lock:
+            self.requests = 0
+            self.retries = 0
+            self.budget_exhausted = 0
+
+    def record_request(self):
+        """Count one request attempt towards the retry budget."""
+        with self._lock:
+            self.requests += 1
+
+    def should_retry(self, attempt):
+        """
+        Decide whether a failed attempt may be retried, consuming budget if so.
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just failed.
+
+        Returns:
+            bool: True if the caller should back off and try again.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        with self._lock:
+            if self.retries >= self.budget_min + self.budget_ratio * self.requests:
+                if not self.budget_exhausted:
+                    logging.warning("Retry budget exhausted; further transient failures will not be retried.")
+                self.budget_exhausted += 1
+                metrics.count("retry_budget_exhausted")
+                return False
+            self.retries += 1
+            return True
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Return the delay before the next attempt.
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just failed.
+            retry_after (str|None): Retry-After header value (seconds or HTTP date).
+
+        Returns:
+            float: Seconds to wait.
+        """
+        delay = retry_after_seconds(retry_after)
+        if delay is not None:
+            return min(self.max_delay, delay)
+
+        # No or unparseable Retry-After: exponential backoff
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+# Shared by every request in the process
+retry_policy = RetryPolicy()
@@ -0,0 +1,212 @@
+"""Run logging: JSON-lines log files written by a single listener thread, with per-link context."""
+
+import hashlib
+import json
+import atexit
+import contextlib
+import contextvars
+import functools
+import time
+import inspect
+import logging
+import logging.handlers
+import queue
+from datetime import datetime
+
+from .links import parse_compare_link
+from .results import ResultRow
+
+
+# --------------------- Logging Configuration ------------------
+# Queue handler on the root logger and the listener thread writing the current run's log;
+# swapped by configure_run_logging(). A handler without a listener is buffering (buffer_run_logging())
+_run_log_handler = None
+_run_log_listener = None
+
+# Per-link context (correlation ID, link, org/repo, stage) of the running thread or asyncio task
+_log_context = contextvars.ContextVar("log_context", default=None)
+
+# Context attributes copied into every JSON log line when present
+LOG_CONTEXT_FIELDS = ("cid", "link", "org", "repo", "stage", "status", "duration_ms")
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format each record as one JSON object per line.
+
+    Link context fields (LOG_CONTEXT_FIELDS) are included when set, so a
+    run's log can be filtered by correlation ID, repository or stage with
+    any JSON tool instead of regular expressions.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for field in LOG_CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RunLogQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hand records to the log writer thread without formatting them.
+
+    The stock QueueHandler formats the message (and any traceback) under its
+    handler lock on the calling thread, which serializes the workers exactly
+    when errors spike. Here the caller only attaches the link context and
+    enqueues; messages and tracebacks are formatted by the QueueListener.
+    """
+
+    def handle(self, record):
+        # The queue is thread-safe, so no handler lock is taken
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return rv
+
+    def prepare(self, record):
+        context = _log_context.get()
+        if context:
+            for field, value in context.items():
+                if not hasattr(record, field):
+                    setattr(record, field, value)
+        return record
+
+
+def stop_run_logging():
+    """Detach the run's log, writing out every queued record first."""
+    global _run_log_handler, _run_log_listener
+    if _run_log_handler is None:
+        return
+    logging.getLogger().removeHandler(_run_log_handler)
+    if _run_log_listener is not None:
+        _run_log_listener.stop()  # Drains the queue
+        for handler in _run_log_listener.handlers:
+            handler.close()
+    _run_log_handler = _run_log_listener = None
+
+
+# Write out records still queued when the process exits (runs before logging.shutdown)
+atexit.register(stop_run_logging)
+
+
+def run_log_configured():
+    """True once configure_run_logging() has opened a log file for this process."""
+    return _run_log_listener is not None
+
+
+def buffer_run_logging():
+    """
+    Hold log records until configure_run_logging() names the run's log file.
+
+    For work done before the run directory exists, such as the pre-check
+    probe, so its records still reach the run's log. They are dropped if
+    no run follows.
+    """
+    global _run_log_handler
+    stop_run_logging()
+    _run_log_handler = RunLogQueueHandler(queue.SimpleQueue())
+    root = logging.getLogger()
+    root.addHandler(_run_log_handler)
+    root.setLevel(logging.INFO)
+
+
+def configure_run_logging(log_path):
+    """
+    Send log records to log_path as JSON lines, replacing the previous run's log file.
+
+    Nothing is configured at import time. Each run directory configures its
+    own log when it is prepared, so batch, watch and shard-worker runs each
+    log where their output is (a second logging.basicConfig() call would be
+    silently ignored).
+
+    Worker threads and asyncio tasks only enqueue records; a single
+    QueueListener thread formats and writes them. Records held by
+    buffer_run_logging() are written first.
+
+    Args:
+        log_path (str): Log file to append to.
+    """
+    global _run_log_handler, _run_log_listener
+    if _run_log_handler is not None and _run_log_listener is None:
+        handler = _run_log_handler  # Keep the buffered records
+    else:
+        stop_run_logging()
+        handler = RunLogQueueHandler(queue.SimpleQueue())
+
+    file_handler = logging.FileHandler(log_path, encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+    listener = logging.handlers.QueueListener(handler.queue, file_handler)
+    listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    _run_log_handler, _run_log_listener = handler, listener
+
+
+def correlation_id(link):
+    """Short stable ID for a link, shared by its log lines in every stage (and across resumed runs)."""
+    return hashlib.sha1(link.encode("utf-8")).hexdigest()[:10]
+
+
+@contextlib.contextmanager
+def link_log_context(link, stage):
+    """Tag log records emitted inside the block with the link's correlation ID, org/repo and stage."""
+    try:
+        org, repo, _, _ = parse_compare_link(link)
+    except ValueError:
+        org = repo = None
+    token = _log_context.set({"cid": correlation_id(link), "link": link, "org": org, "repo": repo, "stage": stage})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def log_stage_outcome(stage, result, start):
+    """Log one structured record with the status and duration of a finished pipeline stage."""
+    row = result if isinstance(result, ResultRow) else result[0]
+    status = row.status if row is not None else "ahead"  # Compare found new commits; create stage is next
+    logging.info(
+        f"{stage.capitalize()} stage finished: {status}",
+        extra={"status": status, "duration_ms": round((time.perf_counter() - start) * 1000, 1)},
+    )
+
+
+def logged_stage(stage):
+    """
+    Decorator for pipeline stages called as func(session, link, ...).
+
+    Runs the stage inside link_log_context() and logs its outcome, for both
+    plain and async stage functions.
+    """
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(session, link, *args):
+                with link_log_context(link, stage):
+                    start = time.perf_counter()
+                    result = await func(session, link, *args)
+                    log_stage_outcome(stage, result, start)
+                    return result
+        else:
+            @functools.wraps(func)
+            def wrapper(session, link, *args):
+                with link_log_context(link, stage):
+                    start = time.perf_counter()
+                    result = func(session, link, *args)
+                    log_stage_outcome(stage, result, start)
+                    return result
+        return wrapper
+    return decorate
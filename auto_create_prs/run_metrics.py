@@ -0,0 +1,183 @@
+"""Timing and counter metrics of a run, written as metrics.json (and Prometheus text)."""
+
+import os
+import json
+import contextlib
+import time
+import logging
+import threading
+from urllib.parse import urlparse
+
+
+# --------------------- Run Metrics ----------------------------
+# Histogram bucket upper bounds in seconds (Prometheus-style, cumulative)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRICS_FILENAME = "metrics.json"
+PROMETHEUS_FILENAME = "metrics.prom"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with count and sum."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                break
+        else:
+            idx = len(LATENCY_BUCKETS)
+        self.buckets[idx] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def to_dict(self):
+        bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 6),
+            "avg_seconds": round(self.sum / self.count, 6) if self.count else 0.0,
+            "buckets": dict(zip(bounds, self.buckets)),
+        }
+
+
+class RunMetrics:
+    """
+    Thread-safe timing and counter registry for one run.
+
+    - requests: latency histograms per (endpoint, status code) for every GitHub call
+    - timings: other histograms, e.g. queue waits (worker pool, rate limiter) and per-link duration
+    - counters: retries, rate-limit parks, and other events
+    - stages: wall time of each step in main()
+    """
+
+    def __init__(self):
+        self.requests = {}
+        self.timings = {}
+        self.counters = {}
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Start over, e.g. for the next file in watch mode; the shared instance stays the same."""
+        with self._lock:
+            self.requests = {}
+            self.timings = {}
+            self.counters = {}
+            self.stages = {}
+
+    def observe_request(self, endpoint, status, seconds):
+        """Record one GitHub API call."""
+        with self._lock:
+            self.requests.setdefault((endpoint, str(status)), Histogram()).observe(seconds)
+
+    def observe(self, name, seconds):
+        """Record one sample of a named timing."""
+        with self._lock:
+            self.timings.setdefault(name, Histogram()).observe(seconds)
+
+    def count(self, name, amount=1):
+        """Increment a named counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block of main() as a named stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = round(self.stages.get(name, 0.0) + time.perf_counter() - start, 6)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "requests": [
+                    {"endpoint": endpoint, "status": status, **histogram.to_dict()}
+                    for (endpoint, status), histogram in sorted(self.requests.items())
+                ],
+                "timings": {name: histogram.to_dict() for name, histogram in sorted(self.timings.items())},
+                "counters": dict(sorted(self.counters.items())),
+                "stages_seconds": dict(self.stages),
+            }
+
+    def to_prometheus(self):
+        """Render the metrics in Prometheus text exposition format."""
+        lines = []
+
+        def histogram_lines(name, labels, histogram):
+            cumulative = 0
+            bounds = [str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"]
+            for bound, bucket in zip(bounds, histogram.buckets):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels.rstrip(',')}}} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{{{labels.rstrip(',')}}} {histogram.count}")
+
+        with self._lock:
+            lines.append("# TYPE github_request_duration_seconds histogram")
+            for (endpoint, status), histogram in sorted(self.requests.items()):
+                labels = f'endpoint="{endpoint}",status="{status}",'
+                histogram_lines("github_request_duration_seconds", labels, histogram)
+
+            lines.append("# TYPE timing_seconds histogram")
+            for name, histogram in sorted(self.timings.items()):
+                histogram_lines("timing_seconds", f'name="{name}",', histogram)
+
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name}_total counter")
+                lines.append(f"{name}_total {value}")
+
+            lines.append("# TYPE stage_duration_seconds gauge")
+            for name, seconds in self.stages.items():
+                lines.append(f'stage_duration_seconds{{stage="{name}"}} {seconds:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every request in the process
+metrics = RunMetrics()
+
+
+def endpoint_name(method, url):
+    """Classify a GitHub API URL into a short endpoint label for metrics."""
+    path = urlparse(url).path
+    if "/compare/" in path:
+        return "compare"
+    if path.endswith("/pulls"):
+        return "create_pull" if method == "POST" else "list_pulls"
+    if "/pulls/" in path:
+        return "get_pull"
+    if path.endswith("/status") or path.endswith("/check-runs"):
+        return "commit_checks"
+    if path.endswith("/graphql"):
+        return "graphql"
+    return "other"
+
+
+def write_run_metrics(output_dir, summary=None, prometheus=False):
+    """
+    Write metrics.json (and optionally metrics.prom) into the run directory.
+
+    Args:
+        output_dir (str): Run directory holding the log.
+        summary (dict|None): Extra run-level figures (status counts, cache, connections).
+        prometheus (bool): Also write Prometheus text format.
+    """
+    report = metrics.to_dict()
+    report["summary"] = summary or {}
+
+    with open(os.path.join(output_dir, METRICS_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    if prometheus:
+        with open(os.path.join(output_dir, PROMETHEUS_FILENAME), "w", encoding="utf-8") as f:
+            f.write(metrics.to_prometheus())
+
+    logging.info(f"Metrics saved to: {os.path.join(output_dir, METRICS_FILENAME)}")
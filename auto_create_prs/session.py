@@ -0,0 +1,119 @@
+"""HTTP sessions for the GitHub API and connection statistics for both engines."""
+
+import threading
+
+from . import config
+
+# Optional: only needed for the asyncio engine; imported on first use by load_aiohttp()
+aiohttp = None
+
+
+def load_aiohttp():
+    """Import aiohttp on first use; return it, or None if it is not installed."""
+    global aiohttp
+    if aiohttp is None:
+        try:
+            import aiohttp as module
+        except ImportError:
+            return None
+        aiohttp = module
+    return aiohttp
+
+# (connect, read) timeout in seconds applied to every GitHub API request
+REQUEST_TIMEOUT = (5, 30)
+
+_session_lock = threading.Lock()
+_thread_local = threading.local()
+_shared_adapter = None
+_requests_sent = 0
+_async_connections_opened = 0
+
+
+def count_request():
+    """Count one request sent by the threaded engine (the asyncio engine counts via its TraceConfig)."""
+    global _requests_sent
+    with _session_lock:
+        _requests_sent += 1
+
+
+def _get_shared_adapter():
+    """Create (once) the HTTPAdapter whose connection pool is shared by all threads."""
+    from requests.adapters import HTTPAdapter
+
+    global _shared_adapter
+    with _session_lock:
+        if _shared_adapter is None:
+            # Keep one keep-alive connection per worker (both stages) so no thread waits on the pool.
+            # Retries are handled by retry_policy in github_request(), not by the adapter.
+            _shared_adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=config.MAX_WORKERS + config.CREATE_WORKERS,
+                max_retries=0,
+            )
+        return _shared_adapter
+
+
+def get_session():
+    """
+    Return the calling thread's pre-configured session for the GitHub API.
+
+    Features:
+    - One session per thread, all backed by a single shared connection pool
+      sized to MAX_WORKERS + CREATE_WORKERS, so TLS connections are reused across links.
+    - Failed requests are retried by github_request() under retry_policy.
+    - github_request() applies REQUEST_TIMEOUT to every request unless overridden.
+    - No Authorization header: github_request() picks a token from token_pool per request.
+
+    Returns:
+        requests.Session: Authenticated session ready for GitHub API requests.
+    """
+    session = getattr(_thread_local, "session", None)
+    if session is not None:
+        return session
+
+    import requests
+
+    session = requests.Session()
+
+    # Mount the shared adapter so every thread reuses the same keep-alive pool
+    session.mount("https://", _get_shared_adapter())
+    session.mount("http://", _get_shared_adapter())
+
+    _thread_local.session = session
+    return session
+
+
+def get_connection_stats():
+    """
+    Report how many TCP/TLS connections were opened versus requests sent.
+
+    Returns:
+        dict: {"connections_opened": int, "requests_sent": int}
+    """
+    connections = 0
+    if _shared_adapter is not None:
+        pools = _shared_adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                connections += pool.num_connections
+
+    connections += _async_connections_opened
+    return {"connections_opened": connections, "requests_sent": _requests_sent}
+
+
+def connection_trace_config():
+    """Build an aiohttp TraceConfig feeding the asyncio engine into get_connection_stats()."""
+
+    async def on_request_start(session, ctx, params):
+        global _requests_sent
+        _requests_sent += 1
+
+    async def on_connection_create_end(session, ctx, params):
+        global _async_connections_opened
+        _async_connections_opened += 1
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    return trace_config
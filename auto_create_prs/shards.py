@@ -0,0 +1,373 @@
+"""Sharded execution: a SQLite queue of link shards processed by several worker processes."""
+
+import os
+import hashlib
+import time
+import logging
+import socket
+import subprocess
+import sys
+import threading
+from datetime import datetime
+
+from .engines import process_all_links, process_all_links_async
+from .journal import RESUME_DONE_STATUSES
+from .links import get_pr_title, parse_compare_link
+from .results import RESULT_FIELDS, ResultRow, ResultStatus, new_stats
+from .run_log import configure_run_logging, run_log_configured
+
+
+# -------------- Sharded Execution -----------------------------
+# SQLite work queue created in the run directory
+SHARD_QUEUE_FILENAME = "shard_queue.sqlite3"
+
+# Shards per worker process, so a fast worker can take over a slow one's remaining shards
+SHARDS_PER_WORKER = 4
+
+# A claimed shard whose worker stops renewing its lease for this long is handed to another worker
+SHARD_LEASE_SECONDS = 300
+
+# Seconds between lease renewals by a live worker; a request parked on a rate
+# limit can take far longer than the lease, so renewal does not wait for results
+SHARD_HEARTBEAT_SECONDS = 60
+
+# Seconds between coordinator progress checks
+SHARD_POLL_SECONDS = 2.0
+
+
+def shard_of(link, shards):
+    """
+    Return the shard number for a link; every link of one repository lands in the same shard.
+
+    Uses a stable hash (not hash()), so every process and host agrees.
+    """
+    try:
+        org, repo, _, _ = parse_compare_link(link)
+        key = f"{org.lower()}/{repo.lower()}"
+    except ValueError:
+        key = link  # Malformed: any shard will do, the worker reports the error
+    digest = hashlib.sha1(key.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % shards
+
+
+class ShardQueue:
+    """
+    Durable work queue of link shards in a SQLite file.
+
+    The coordinator fills it; worker processes on this host (or on others
+    that see the same file over a shared filesystem) claim one shard at a
+    time, write each result row as it finishes and mark the shard done.
+    A live worker renews its lease every SHARD_HEARTBEAT_SECONDS from a
+    background thread (start_heartbeat()); a shard whose lease is not
+    renewed for SHARD_LEASE_SECONDS can be claimed again. Links that
+    already have a finished row are not repeated.
+
+    The object also acts as a result journal: append(row) records a row and
+    renews the lease of this worker's shard. A Created row is never
+    replaced, so a worker that retakes an abandoned shard cannot turn a PR
+    created by the previous owner into a Duplicate.
+    """
+
+    def __init__(self, path, worker_id=None):
+        self.path = path
+        self.worker_id = worker_id
+        self._lock = threading.Lock()
+        self._heartbeat_stop = threading.Event()
+        self._heartbeat_thread = None
+        import sqlite3
+
+        # Autocommit; write transactions are opened explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS shards (
+                id INTEGER PRIMARY KEY, state TEXT NOT NULL, worker TEXT, heartbeat REAL);
+            CREATE TABLE IF NOT EXISTS links (
+                position INTEGER PRIMARY KEY, shard_id INTEGER NOT NULL, link TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS results (
+                link TEXT PRIMARY KEY, status TEXT, pr_link TEXT,
+                commits TEXT, files_changed TEXT, reason TEXT);
+        """)
+
+    def fill(self, compare_links, pr_title, shards):
+        """
+        Replace the queued work with compare_links split into `shards` shards.
+
+        Finished rows from an earlier fill (e.g. a resumed run) are kept, so
+        those links are not processed again.
+        """
+        by_shard = {}
+        for position, link in enumerate(compare_links):
+            by_shard.setdefault(shard_of(link, shards), []).append((position, link))
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute("DELETE FROM shards")
+            self._db.execute("DELETE FROM links")
+            self._db.execute("DELETE FROM results WHERE status NOT IN (?, ?, ?)", RESUME_DONE_STATUSES)
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('pr_title', ?)", (pr_title,))
+            for shard_id, items in by_shard.items():
+                self._db.execute("INSERT INTO shards VALUES (?, 'pending', NULL, NULL)", (shard_id,))
+                self._db.executemany(
+                    "INSERT INTO links VALUES (?, ?, ?)", [(pos, shard_id, link) for pos, link in items]
+                )
+            self._db.execute("COMMIT")
+        return len(by_shard)
+
+    def pr_title(self):
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'pr_title'").fetchone()
+        return row[0] if row else get_pr_title()
+
+    def claim(self):
+        """
+        Claim the next pending (or abandoned) shard for this worker.
+
+        Returns:
+            tuple|None: (shard_id, links still to process), or None if nothing is claimable.
+        """
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM shards WHERE state = 'pending' OR (state = 'claimed' AND heartbeat < ?) "
+                    "ORDER BY id LIMIT 1",
+                    (time.time() - SHARD_LEASE_SECONDS,),
+                ).fetchone()
+                if row is None:
+                    return None
+                shard_id = row[0]
+                self._db.execute(
+                    "UPDATE shards SET state = 'claimed', worker = ?, heartbeat = ? WHERE id = ?",
+                    (self.worker_id, time.time(), shard_id),
+                )
+                links = [link for (link,) in self._db.execute(
+                    "SELECT link FROM links WHERE shard_id = ? AND link NOT IN "
+                    "(SELECT link FROM results WHERE status IN (?, ?, ?)) ORDER BY position",
+                    (shard_id, *RESUME_DONE_STATUSES),
+                )]
+            finally:
+                self._db.execute("COMMIT")
+        return shard_id, list(dict.fromkeys(links))
+
+    def append(self, row):
+        """Record one finished result row and renew this worker's lease."""
+        record = row.to_record()
+        values = [record[field] for field in RESULT_FIELDS]
+        updates = ", ".join(f"{field} = excluded.{field}" for field in RESULT_FIELDS[1:])
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            self._db.execute(
+                f"INSERT INTO results VALUES (?, ?, ?, ?, ?, ?) "
+                f"ON CONFLICT(link) DO UPDATE SET {updates} WHERE results.status != ?",
+                (*values, ResultStatus.CREATED.value),
+            )
+            self._renew_lease()
+            self._db.execute("COMMIT")
+
+    def _renew_lease(self):
+        self._db.execute(
+            "UPDATE shards SET heartbeat = ? WHERE worker = ? AND state = 'claimed'",
+            (time.time(), self.worker_id),
+        )
+
+    def start_heartbeat(self):
+        """Renew this worker's lease every SHARD_HEARTBEAT_SECONDS until stop_heartbeat()."""
+        def beat():
+            while not self._heartbeat_stop.wait(SHARD_HEARTBEAT_SECONDS):
+                with self._lock:
+                    self._renew_lease()
+
+        self._heartbeat_stop.clear()
+        self._heartbeat_thread = threading.Thread(target=beat, name="shard-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        if self._heartbeat_thread is not None:
+            self._heartbeat_stop.set()
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+
+    def complete(self, shard_id):
+        """Mark a claimed shard as done."""
+        with self._lock:
+            self._db.execute("UPDATE shards SET state = 'done' WHERE id = ?", (shard_id,))
+
+    def release_worker(self, worker_id):
+        """Return a dead worker's unfinished shards to the queue."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE shards SET state = 'pending', worker = NULL WHERE worker = ? AND state = 'claimed'",
+                (worker_id,),
+            )
+
+    def progress(self):
+        """
+        Returns:
+            dict: Shard counts by state ("pending", "claimed", "done", "live" claims)
+            and finished link count ("results").
+        """
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM shards GROUP BY state").fetchall())
+            counts["live"] = self._db.execute(
+                "SELECT COUNT(*) FROM shards WHERE state = 'claimed' AND heartbeat >= ?",
+                (time.time() - SHARD_LEASE_SECONDS,),
+            ).fetchone()[0]
+            counts["results"] = self._db.execute(
+                "SELECT COUNT(*) FROM results WHERE link IN (SELECT link FROM links)"
+            ).fetchone()[0]
+        return counts
+
+    def results(self):
+        """Return {link: result row} for every finished link."""
+        rows = {}
+        with self._lock:
+            for values in self._db.execute("SELECT * FROM results"):
+                # Counts come back as text; from_record() restores numbers and truncation
+                rows[values[0]] = ResultRow.from_record(dict(zip(RESULT_FIELDS, values)))
+        return rows
+
+    def close(self):
+        self.stop_heartbeat()
+        self._db.close()
+
+
+def run_shard_worker(queue_path, args):
+    """
+    Claim and process shards from a ShardQueue until none are left.
+
+    Started by process_all_links_sharded() for local workers; run it by hand
+    (--shard-worker QUEUE) on other hosts that share the run directory.
+
+    Args:
+        queue_path (str): Path of the coordinator's shard_queue.sqlite3.
+        args (argparse.Namespace): Parsed command-line options (engine, concurrency, ...).
+
+    Returns:
+        int: Number of shards this worker processed.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    if not run_log_configured():
+        # Standalone worker: log next to the queue
+        queue_dir = os.path.dirname(os.path.abspath(queue_path))
+        configure_run_logging(os.path.join(queue_dir, f"log_worker_{worker_id.replace(':', '_')}.jsonl"))
+    shard_queue = ShardQueue(queue_path, worker_id)
+    pr_title = shard_queue.pr_title()
+    processed = 0
+    shard_queue.start_heartbeat()
+    try:
+        while True:
+            claimed = shard_queue.claim()
+            if claimed is None:
+                return processed
+            shard_id, links = claimed
+            print(f"🧩 {worker_id}: shard {shard_id}, {len(links)} links", flush=True)
+            logging.info(f"Shard worker {worker_id} claimed shard {shard_id} ({len(links)} links)")
+            if args.engine == "asyncio":
+                process_all_links_async(links, pr_title, args.concurrency, shard_queue)
+            else:
+                process_all_links(links, pr_title, shard_queue)
+            shard_queue.complete(shard_id)
+            processed += 1
+    finally:
+        shard_queue.close()
+
+
+def shard_worker_command(queue_path, args):
+    """Command line that starts one local shard worker with the coordinator's options."""
+    command = [
+        sys.executable, "-m", __package__ or "auto_create_prs", "--shard-worker", os.path.abspath(queue_path),
+        "--engine", args.engine,
+        "--compare-mode", args.compare_mode,
+        "--concurrency", str(args.concurrency),
+        "--create-workers", str(args.create_workers),
+    ]
+    if args.no_cache:
+        command.append("--no-cache")
+    return command
+
+
+def process_all_links_sharded(compare_links, pr_title, output_dir, args, journal=None):
+    """
+    Process compare links with args.shards worker processes sharing a SQLite work queue.
+
+    Links are sharded by (org, repo), so one repository's PR listing and
+    cache entries stay within one worker. The coordinator (this process)
+    starts the local workers, reports progress, drains any shards left by
+    workers that died, and merges every result row.
+
+    Args:
+        compare_links (list[str]): List of GitHub compare URLs to process.
+        pr_title (str): Title to use when creating pull requests.
+        output_dir (str): Run directory; holds the queue and worker output.
+        args (argparse.Namespace): Parsed command-line options.
+        journal (ResultJournal|None): If given, each merged row is appended to it.
+
+    Returns:
+        results (list[ResultRow]): Same shape as process_all_links().
+        stats (dict): Same shape as process_all_links().
+    """
+    if not compare_links:
+        return [], new_stats()
+
+    queue_path = os.path.join(output_dir, SHARD_QUEUE_FILENAME)
+    shard_queue = ShardQueue(queue_path)
+    shards = shard_queue.fill(compare_links, pr_title, args.shards * SHARDS_PER_WORKER)
+    total = len(set(compare_links))
+    print(f"🧩 {total} links in {shards} shards; starting {args.shards} worker processes "
+          f"(other hosts can join with --shard-worker \"{queue_path}\")")
+
+    # ---- Start local workers, each writing its console output to its own file
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    worker_env = dict(os.environ)
+    worker_env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, worker_env.get("PYTHONPATH")]))
+    workers = []
+    for idx in range(args.shards):
+        output = open(os.path.join(output_dir, f"shard_worker_{idx + 1}.txt"), "w", encoding="utf-8")
+        process = subprocess.Popen(
+            shard_worker_command(queue_path, args), stdout=output, stderr=subprocess.STDOUT, env=worker_env
+        )
+        workers.append((process, output))
+
+    # ---- Wait for every shard, reclaiming work from workers that exit early
+    try:
+        last = -1
+        while True:
+            time.sleep(SHARD_POLL_SECONDS)
+            progress = shard_queue.progress()
+            if progress["results"] != last:
+                last = progress["results"]
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Processed {last}/{total} links "
+                      f"({progress.get('done', 0)}/{shards} shards done)...")
+
+            for process, _ in workers:
+                if process.poll() is not None:
+                    shard_queue.release_worker(f"{socket.gethostname()}:{process.pid}")
+
+            if progress.get("done", 0) == shards:
+                break
+            if all(process.poll() is not None for process, _ in workers) and not progress["live"]:
+                # Local workers are gone and nobody else holds a live lease: finish the rest here
+                print("🧩 Processing remaining shards in the coordinator...")
+                run_shard_worker(queue_path, args)
+    finally:
+        for process, output in workers:
+            if process.poll() is None:
+                process.terminate()
+            process.wait()
+            output.close()
+            if process.returncode:
+                logging.warning(f"Shard worker {process.pid} exited with code {process.returncode}")
+
+    # ---- Merge result rows in input order
+    finished = shard_queue.results()
+    shard_queue.close()
+    results = []
+    stats = new_stats()
+    for link in compare_links:
+        row = finished.get(link) or ResultRow(link, ResultStatus.ERROR, reason="Not processed by any shard worker.")
+        results.append(row)
+        stats[row.status] += 1
+        if journal is not None:
+            journal.append(row)
+
+    return results, stats
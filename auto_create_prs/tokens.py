@@ -0,0 +1,139 @@
+"""Pool of GitHub tokens; requests go out on the token with the most remaining budget."""
+
+import time
+import logging
+import threading
+
+from . import config
+from .run_metrics import metrics
+
+
+# --------------------- Token Pool -----------------------------
+# Assumed hourly budget of a token GitHub has not reported on yet
+DEFAULT_TOKEN_BUDGET = 5000
+
+
+def _mask_token(token):
+    """Short, log-safe label for a token."""
+    return f"…{token[-4:]}" if len(token) > 4 else "…"
+
+
+class TokenPool:
+    """
+    Spread GitHub requests over several tokens by remaining budget.
+
+    Each token's limit, remaining and reset time are learned from the
+    X-RateLimit-* headers of responses it authenticated. acquire() hands out
+    the token with the most headroom (remaining budget minus requests in
+    flight). A token that answers 401 is revoked and the request is resent
+    with another one; a token that hits its primary limit is skipped until
+    its reset while others still have budget. The last token is never
+    revoked, so with a single token behaviour is unchanged.
+
+    Tokens are read from GITHUB_TOKEN and GITHUB_TOKENS on first use.
+    """
+
+    def __init__(self):
+        self._tokens = None  # token → {"limit", "remaining", "reset", "in_flight", "requests"}
+        self.revoked = []
+        self._lock = threading.Lock()
+
+    def _load(self):
+        """Build the token table on first use (caller holds the lock)."""
+        if self._tokens is None:
+            self._tokens = {}
+            for token in [config.GITHUB_TOKEN, *config.GITHUB_TOKENS]:
+                if token and token not in self._tokens:
+                    self._tokens[token] = {"limit": None, "remaining": None, "reset": 0.0, "in_flight": 0, "requests": 0}
+        return self._tokens
+
+    @staticmethod
+    def _remaining(state, now):
+        """Budget left on a token, assuming a full window once its reset has passed."""
+        if state["remaining"] is None or now >= state["reset"]:
+            return state["limit"] or DEFAULT_TOKEN_BUDGET
+        return state["remaining"]
+
+    def acquire(self):
+        """Return the token with the most headroom and count a request in flight on it."""
+        with self._lock:
+            tokens = self._load()
+            now = time.time()
+            token = max(tokens, key=lambda t: self._remaining(tokens[t], now) - tokens[t]["in_flight"])
+            tokens[token]["in_flight"] += 1
+            tokens[token]["requests"] += 1
+            return token
+
+    def release(self, token, status_code, headers):
+        """
+        Record the response a token received.
+
+        Args:
+            token (str): Token returned by acquire().
+            status_code (int): HTTP status, or 0 if no response was received.
+            headers (Mapping): Response headers.
+
+        Returns:
+            bool: True if the request should be resent straight away with
+            another token (this one was revoked or its budget is spent).
+        """
+        with self._lock:
+            tokens = self._load()
+            state = tokens.get(token)
+            if state is None:
+                # Revoked while this request was in flight: resend if it failed for the same reason
+                return status_code == 401
+            state["in_flight"] -= 1
+
+            remaining = headers.get("X-RateLimit-Remaining")
+            limit = headers.get("X-RateLimit-Limit")
+            reset = headers.get("X-RateLimit-Reset")
+            if remaining is not None and limit is not None:
+                state["remaining"] = int(remaining)
+                state["limit"] = int(limit)
+                state["reset"] = float(reset) if reset is not None else time.time() + 3600
+
+            # ---- Revoked or expired token: drop it unless it is the last one
+            if status_code == 401 and len(tokens) > 1:
+                del tokens[token]
+                self.revoked.append(_mask_token(token))
+                logging.warning(f"GitHub token {_mask_token(token)} returned 401; removed from the pool")
+                metrics.count("tokens_revoked")
+                return True
+
+            # ---- This token's primary budget is spent: switch if another has some left
+            if status_code in (403, 429) and remaining == "0":
+                now = time.time()
+                if any(self._remaining(other, now) > 0 for t, other in tokens.items() if t != token):
+                    metrics.count("token_switches")
+                    return True
+
+            return False
+
+    def budget(self):
+        """
+        Combined budget of the pool, for the rate-limit scheduler.
+
+        Returns:
+            tuple: (remaining, limit, reset) summed over active tokens; reset is
+            the earliest reset epoch when every token is exhausted, else None.
+        """
+        with self._lock:
+            tokens = self._load()
+            now = time.time()
+            if all(state["remaining"] is None for state in tokens.values()):
+                return None, None, None
+
+            remaining = sum(self._remaining(state, now) for state in tokens.values())
+            limit = sum(state["limit"] or DEFAULT_TOKEN_BUDGET for state in tokens.values())
+            reset = min(state["reset"] for state in tokens.values()) if remaining == 0 else None
+            return remaining, limit, reset
+
+    def usage(self):
+        """Return {masked token: requests sent} for the summary."""
+        with self._lock:
+            return {_mask_token(token): state["requests"] for token, state in self._load().items()}
+
+
+# Shared by every request in the process
+token_pool = TokenPool()
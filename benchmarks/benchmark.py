@@ -0,0 +1,243 @@
+"""
+Throughput benchmark for the auto_create_prs package against a local mock GitHub API.
+
+For every combination of workload size, engine and concurrency level, the
+harness starts a fresh mock_github_server.py process, then runs the real
+process_all_links() / process_all_links_async() in a separate client process
+and reports:
+    - links/sec
+    - p50 / p95 per-link latency
+    - API calls per link
+    - peak RSS of the client process
+
+Examples:
+    python benchmark.py
+    python benchmark.py --sizes 1000 --engines threads,asyncio --concurrency 5,20
+    python benchmark.py --sizes 1000 --rate-limit 500 --rate-window 5 --burst-every 200
+    python benchmark.py --sizes 1000 --create-latency-ms 1500 --create-workers 3
+    python benchmark.py --json results.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from mock_github_server import add_server_arguments
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+SERVER_PATH = os.path.join(BENCH_DIR, "mock_github_server.py")
+
+SERVER_OPTIONS = [
+    "latency_ms", "jitter_ms", "create_latency_ms", "commits", "files", "patch_bytes", "empty_rate",
+    "duplicate_rate", "burst_every", "burst_length", "rate_limit", "rate_window",
+]
+
+
+# --------------------- Helpers --------------------------------
+def percentile(values, pct):
+    """Return the pct-th percentile (nearest rank) of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+
+
+def make_links(count, repos):
+    """Build synthetic compare links spread over `repos` repositories."""
+    return [
+        f"https://github.com/bench-org/repo-{i % repos}/compare/main...feature-{i}"
+        for i in range(count)
+    ]
+
+
+def load_package():
+    """Import the auto_create_prs package (and its config module) from this checkout."""
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    return importlib.import_module("auto_create_prs"), importlib.import_module("auto_create_prs.config")
+
+
+# --------------------- Client Process -------------------------
+def run_client(args):
+    """
+    Run one workload against the mock server and print a JSON result line.
+
+    Executed in its own process so peak RSS reflects just this workload.
+    """
+    package, config = load_package()
+    from auto_create_prs.run_metrics import metrics
+    from auto_create_prs.session import get_connection_stats
+
+    config.GITHUB_API_URL = f"http://127.0.0.1:{args.port}"
+    config.HTTP_CACHE_ENABLED = False  # Measure the API path, not the on-disk cache
+    config.CREATE_WORKERS = args.create_workers
+    if args.engine == "threads":
+        config.MAX_WORKERS = args.concurrency
+
+    # ---- Keep every per-link duration the engines report (link start to result, across both stages)
+    latencies = []
+    observe = metrics.observe
+
+    def recording_observe(name, seconds):
+        if name == "link_duration":
+            latencies.append(seconds)
+        observe(name, seconds)
+
+    metrics.observe = recording_observe
+
+    links = make_links(args.links, args.repos)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence progress output
+        if args.engine == "asyncio":
+            results, stats = package.process_all_links_async(links, "Benchmark Publish", args.concurrency)
+        else:
+            results, stats = package.process_all_links(links, "Benchmark Publish")
+    elapsed = time.perf_counter() - start
+
+    requests_sent = get_connection_stats()["requests_sent"]
+    print(json.dumps({
+        "links": args.links,
+        "engine": args.engine,
+        "concurrency": args.concurrency,
+        "seconds": round(elapsed, 3),
+        "links_per_sec": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "api_calls_per_link": round(requests_sent / max(1, len(results)), 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "stats": stats,
+    }))
+
+
+# --------------------- Coordinator ----------------------------
+def start_server(args):
+    """Start mock_github_server.py with the chosen options; return (process, port)."""
+    command = [sys.executable, SERVER_PATH, "--port", "0"]
+    for name in SERVER_OPTIONS:
+        command += [f"--{name.replace('_', '-')}", str(getattr(args, name))]
+
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = server.stdout.readline().strip()
+    if not line.startswith("PORT "):
+        server.kill()
+        raise RuntimeError(f"Mock server failed to start: {line!r}")
+    return server, int(line.split()[1])
+
+
+def run_workload(args, size, engine, concurrency):
+    """Run one (size, engine, concurrency) combination against a fresh server."""
+    server, port = start_server(args)
+
+    # The client writes nothing by itself (the HTTP cache is off), but BASE_OUTPUT_DIR
+    # is under HOME: point HOME at a scratch directory removed after the workload, so
+    # anything a run does write never lands on the real Desktop
+    try:
+        with tempfile.TemporaryDirectory(prefix="pr_bench_") as scratch:
+            env = dict(os.environ)
+            env["HOME"] = env["USERPROFILE"] = scratch
+            command = [
+                sys.executable, os.path.abspath(__file__), "--client",
+                "--port", str(port),
+                "--links", str(size),
+                "--repos", str(args.repos),
+                "--engine", engine,
+                "--concurrency", str(concurrency),
+                "--create-workers", str(args.create_workers),
+            ]
+            output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+            return json.loads(output.strip().splitlines()[-1])
+    finally:
+        server.kill()
+        server.wait()
+
+
+def print_table(rows):
+    """Print benchmark results as an aligned table."""
+    header = ["links", "engine", "conc", "sec", "links/s", "p50 ms", "p95 ms", "calls/link", "peak MB", "results"]
+    lines = [header]
+    for row in rows:
+        stats = row["stats"]
+        lines.append([
+            row["links"], row["engine"], row["concurrency"], row["seconds"], row["links_per_sec"],
+            row["p50_ms"], row["p95_ms"], row["api_calls_per_link"], row["peak_rss_mb"],
+            f"C{stats['Created']}/S{stats['Skipped']}/D{stats['Duplicate']}/E{stats['Error']}",
+        ])
+
+    widths = [max(len(str(line[i])) for line in lines) for i in range(len(header))]
+    for line in lines:
+        print("  ".join(str(value).rjust(width) for value, width in zip(line, widths)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark auto-create-prs.py against a mock GitHub API.")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated link counts.")
+    parser.add_argument("--engines", default="threads,asyncio", help="Comma-separated engines.")
+    parser.add_argument("--concurrency", default="5,20", help="Comma-separated concurrency levels.")
+    parser.add_argument("--repos", type=int, default=50, help="Number of repositories links are spread over.")
+    parser.add_argument("--create-workers", type=int, default=5, help="PR creations in flight (CREATE_WORKERS).")
+    parser.add_argument("--json", help="Also write results to this JSON file.")
+
+    # Internal: run a single workload in this process
+    parser.add_argument("--client", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--links", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--engine", help=argparse.SUPPRESS)
+
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+
+    if args.client:
+        args.concurrency = int(args.concurrency)
+        run_client(args)
+        return
+
+    rows = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        for engine in args.engines.split(","):
+            for concurrency in (int(value) for value in args.concurrency.split(",")):
+                print(f"▶ {size} links, {engine}, concurrency {concurrency} ...", flush=True)
+                rows.append(run_workload(args, size, engine, concurrency))
+
+    print()
+    print_table(rows)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
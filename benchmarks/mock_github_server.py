@@ -0,0 +1,302 @@
+"""
+Local stand-in for the GitHub REST endpoints used by auto-create-prs.py.
+
+Serves:
+    GET  /repos/{org}/{repo}/compare/{base}...{head}
+    GET  /repos/{org}/{repo}/pulls        (state/head/base filters, per_page/page pagination)
+    POST /repos/{org}/{repo}/pulls
+    GET  /_stats                          (request counters, for the benchmark harness)
+
+Behaviour is deterministic per branch name, so repeated runs see the same workload:
+    - heads whose hash falls under --empty-rate have no commits (Skipped)
+    - heads whose hash falls under --duplicate-rate already have an open PR (422 on create)
+    - heads starting with "missing" return 404 from compare
+
+Run standalone:
+    python mock_github_server.py --port 8765 --latency-ms 50
+The chosen port is printed on the first line of stdout as "PORT <n>".
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+COMPARE_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/compare/(.+?)\.\.\.(.+)$")
+PULLS_PATH = re.compile(r"^/repos/([^/]+)/([^/]+)/pulls$")
+
+
+# --------------------- Server State ---------------------------
+class MockGitHubState:
+    """Shared, lock-protected state of the stand-in API."""
+
+    def __init__(self, options):
+        self.options = options
+        self.lock = threading.Lock()
+        self.pulls = {}  # (org, repo) → {(base, head): pr}
+        self.next_number = 1
+        self.requests = 0
+        self.by_endpoint = {}
+        self.window_start = time.time()
+        self.window_used = 0
+
+    def fraction(self, name, salt):
+        """Map a branch name to a stable value in [0, 1)."""
+        digest = hashlib.sha1(f"{salt}:{name}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32
+
+    def seed_duplicate(self, org, repo, base, head):
+        """Create the pre-existing PR for a head selected by --duplicate-rate."""
+        repo_pulls = self.pulls.setdefault((org, repo), {})
+        if (base, head) not in repo_pulls and self.fraction(head, "dup") < self.options.duplicate_rate:
+            # Opened well before the run, like a real leftover PR
+            repo_pulls[(base, head)] = self.new_pr(org, repo, base, head, created=time.time() - 86400)
+
+    def new_pr(self, org, repo, base, head, created=None):
+        number = self.next_number
+        self.next_number += 1
+        return {
+            "number": number,
+            "html_url": f"https://github.com/{org}/{repo}/pull/{number}",
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created or time.time())),
+            "state": "open",
+            "base": {"ref": base},
+            "head": {"ref": head, "label": f"{org}:{head}"},
+        }
+
+    def count(self, endpoint):
+        """Record one request and return (rate_limited, remaining, reset_epoch)."""
+        with self.lock:
+            self.requests += 1
+            self.by_endpoint[endpoint] = self.by_endpoint.get(endpoint, 0) + 1
+
+            limit = self.options.rate_limit
+            if not limit:
+                return False, 5000, int(time.time()) + 3600
+
+            now = time.time()
+            if now - self.window_start >= self.options.rate_window:
+                self.window_start = now
+                self.window_used = 0
+            reset = int(self.window_start + self.options.rate_window) + 1
+            if self.window_used >= limit:
+                return True, 0, reset
+            self.window_used += 1
+            return False, limit - self.window_used, reset
+
+    def in_error_burst(self):
+        """True while the current request falls inside a configured 5xx burst."""
+        every = self.options.burst_every
+        return bool(every) and (self.requests % every) < self.options.burst_length
+
+
+# --------------------- Request Handler ------------------------
+class MockGitHubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like api.github.com
+    disable_nagle_algorithm = True  # Avoid Nagle/delayed-ACK stalls between header and body writes
+    state = None  # Set by make_server()
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def begin(self, endpoint):
+        """
+        Apply latency, rate limiting and error bursts common to every endpoint.
+
+        Returns:
+            dict or None: Rate-limit headers for the reply, or None if a reply was already sent.
+        """
+        options = self.state.options
+        limited, remaining, reset = self.state.count(endpoint)
+        headers = {
+            "X-RateLimit-Limit": str(options.rate_limit or 5000),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(reset),
+        }
+
+        if options.latency_ms:
+            jitter = random.uniform(-options.jitter_ms, options.jitter_ms) if options.jitter_ms else 0
+            time.sleep(max(0.0, options.latency_ms + jitter) / 1000)
+
+        if limited:
+            self.send_json(403, {"message": "API rate limit exceeded"}, headers)
+            return None
+        if self.state.in_error_burst():
+            self.send_json(503, {"message": "Service Unavailable"}, headers)
+            return None
+        return headers
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == "/_stats":
+            with self.state.lock:
+                stats = {"requests": self.state.requests, "by_endpoint": dict(self.state.by_endpoint)}
+            self.send_json(200, stats)
+            return
+
+        match = COMPARE_PATH.match(parsed.path)
+        if match:
+            self.handle_compare(*match.groups(), query)
+            return
+
+        match = PULLS_PATH.match(parsed.path)
+        if match:
+            self.handle_list_pulls(*match.groups(), query)
+            return
+
+        self.send_json(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        data = json.loads(self.rfile.read(length) or b"{}")
+
+        match = PULLS_PATH.match(parsed.path)
+        if match:
+            self.handle_create_pull(*match.groups(), data)
+            return
+
+        self.send_json(404, {"message": "Not Found"})
+
+    def handle_compare(self, org, repo, base, head, query):
+        headers = self.begin("compare")
+        if headers is None:
+            return
+        options = self.state.options
+
+        if head.startswith("missing"):
+            self.send_json(404, {"message": "Not Found"}, headers)
+            return
+
+        # Heads picked by --duplicate-rate get their "existing" PR on first sight
+        with self.state.lock:
+            self.state.seed_duplicate(org, repo, base, head)
+
+        commits = 0 if self.state.fraction(head, "empty") < options.empty_rate else options.commits
+        per_page = int(query.get("per_page", ["250"])[0])
+        files = [
+            {"filename": f"docs/file_{i}.md", "status": "modified", "changes": 2, "patch": "+" * options.patch_bytes}
+            for i in range(min(options.files, 300))
+        ]
+        payload = {
+            "status": "ahead" if commits else "identical",
+            "ahead_by": commits,
+            "behind_by": 0,
+            "total_commits": commits,
+            "commits": [{"sha": f"{i:040x}"} for i in range(min(commits, per_page))],
+            "files": files,
+        }
+        self.send_json(200, payload, headers)
+
+    def handle_list_pulls(self, org, repo, query):
+        headers = self.begin("list_pulls")
+        if headers is None:
+            return
+
+        with self.state.lock:
+            pulls = list(self.state.pulls.get((org, repo), {}).values())
+
+        # ---- Server-side filters
+        if "head" in query:
+            pulls = [pr for pr in pulls if pr["head"]["label"] == query["head"][0]]
+        if "base" in query:
+            pulls = [pr for pr in pulls if pr["base"]["ref"] == query["base"][0]]
+
+        # ---- Pagination
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        chunk = pulls[(page - 1) * per_page:page * per_page]
+        if page * per_page < len(pulls):
+            headers["Link"] = f'<{self.path}&page={page + 1}>; rel="next"'
+
+        self.send_json(200, chunk, headers)
+
+    def handle_create_pull(self, org, repo, data):
+        headers = self.begin("create_pull")
+        if headers is None:
+            return
+        if self.state.options.create_latency_ms:
+            time.sleep(self.state.options.create_latency_ms / 1000)  # PR creation is slow on GitHub
+
+        base, head = data.get("base"), data.get("head")
+        with self.state.lock:
+            repo_pulls = self.state.pulls.setdefault((org, repo), {})
+            if (base, head) in repo_pulls:
+                self.send_json(422, {"message": "Validation Failed"}, headers)
+                return
+            pr = self.state.new_pr(org, repo, base, head)
+            repo_pulls[(base, head)] = pr
+
+        self.send_json(201, pr, headers)
+
+
+# --------------------- Server Setup ---------------------------
+def make_server(options, port=0):
+    """
+    Build a threaded mock server.
+
+    Args:
+        options (argparse.Namespace): Behaviour options from parse_args().
+        port (int): Port to bind on 127.0.0.1; 0 picks a free port.
+
+    Returns:
+        ThreadingHTTPServer: Server ready for serve_forever().
+    """
+    state = MockGitHubState(options)
+    handler = type("BoundMockGitHubHandler", (MockGitHubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.state = state
+    return server
+
+
+def add_server_arguments(parser):
+    """Register the mock server's behaviour options on an ArgumentParser."""
+    parser.add_argument("--latency-ms", type=float, default=50, help="Base latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="Uniform +/- jitter on latency.")
+    parser.add_argument("--create-latency-ms", type=float, default=0, help="Extra latency on PR creation.")
+    parser.add_argument("--commits", type=int, default=3, help="Commits ahead for non-empty compares.")
+    parser.add_argument("--files", type=int, default=20, help="Changed files per compare (max 300).")
+    parser.add_argument("--patch-bytes", type=int, default=2000, help="Patch size per changed file.")
+    parser.add_argument("--empty-rate", type=float, default=0.2, help="Share of links with no new commits.")
+    parser.add_argument("--duplicate-rate", type=float, default=0.1, help="Share of links whose PR already exists.")
+    parser.add_argument("--burst-every", type=int, default=0, help="Start a 5xx burst every N requests (0: off).")
+    parser.add_argument("--burst-length", type=int, default=5, help="Requests per 5xx burst.")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per rate window before 403 (0: off).")
+    parser.add_argument("--rate-window", type=float, default=10, help="Rate-limit window in seconds.")
+    return parser
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock GitHub API for benchmarking auto-create-prs.py.")
+    parser.add_argument("--port", type=int, default=0, help="Port to listen on (0: any free port).")
+    add_server_arguments(parser)
+    options = parser.parse_args()
+
+    server = make_server(options, options.port)
+    print(f"PORT {server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
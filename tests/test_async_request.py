@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import pytest
+
+from auto_create_prs import api
+from auto_create_prs.compare import CompareScanner
+
+aiohttp = pytest.importorskip("aiohttp")
+
+BODY = json.dumps({
+    "total_commits": 2,
+    "commits": [{"sha": "abc"}],
+    "files": [{"filename": f"f{i}", "patch": "@@ -1 +1 @@"} for i in range(10)],
+}).encode("utf-8")
+
+
+class FakeContent:
+    def __init__(self, body, drop_after):
+        self._body = body
+        self._drop_after = drop_after
+
+    async def iter_chunked(self, size):
+        sent = 0
+        while sent < len(self._body):
+            if self._drop_after is not None and sent >= self._drop_after:
+                raise aiohttp.ClientPayloadError("connection dropped")
+            step = min(size, len(self._body) - sent)
+            if self._drop_after is not None:
+                step = min(step, self._drop_after - sent)
+            yield self._body[sent:sent + step]
+            sent += step
+
+
+class FakeResponse:
+    def __init__(self, drop_after):
+        self.status = 200
+        self.headers = {}
+        self.content = FakeContent(BODY, drop_after)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def __init__(self, drops):
+        self._drops = list(drops)
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self._drops.pop(0))
+
+
+def test_retry_after_dropped_body_rescans_from_scratch(monkeypatch):
+    monkeypatch.setattr(api.retry_policy, "backoff", lambda *args, **kwargs: 0)
+    scanner = CompareScanner()
+    session = FakeSession([len(BODY) // 2, None])
+
+    status, payload, _ = asyncio.run(
+        api.github_request_async(session, "GET", "https://api.github.com/repos/o/r/compare/a...b", scanner=scanner)
+    )
+
+    assert (status, payload) == (200, None)
+    assert (scanner.total_commits, scanner.files) == (2, 10)
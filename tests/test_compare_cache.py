@@ -0,0 +1,57 @@
+import json
+
+from auto_create_prs import cache, compare, config
+from auto_create_prs.results import FILES_TRUNCATED, TruncatedCount, format_cell
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def compare_body(commits, files):
+    return json.dumps({
+        "total_commits": commits,
+        "commits": [{"sha": "abc"}],
+        "files": [{"filename": f"f{i}", "patch": "@@"} for i in range(files)],
+    }).encode("utf-8")
+
+
+def test_truncated_files_survive_a_304(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "http_cache", cache.HTTPCache(str(tmp_path), cache.HTTP_CACHE_MAX_BYTES))
+    monkeypatch.setattr(config, "HTTP_CACHE_ENABLED", True)
+    monkeypatch.setattr(config, "COMPARE_MODE", "light")
+    replies = [
+        FakeResponse(200, compare_body(5, 300), {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ]
+    sent = []
+
+    def fake_request(session, method, url, headers=None, **kwargs):
+        sent.append(headers)
+        return replies.pop(0)
+
+    monkeypatch.setattr(cache, "github_request", fake_request)
+
+    first = compare.fetch_compare(None, "org", "repo", "main", "dev")
+    second = compare.fetch_compare(None, "org", "repo", "main", "dev")
+
+    assert sent[1] == {"If-None-Match": '"v1"'}
+    assert first == second == (200, 5, FILES_TRUNCATED)
+    assert isinstance(second[2], TruncatedCount)
+    assert format_cell(second[2]) == "300+"
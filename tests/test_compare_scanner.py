@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from auto_create_prs.compare import CompareScanner, summarize_compare
+
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1024, 1 << 20]
+
+
+def compare_payload(files, total_commits=3):
+    """A compare body shaped like GitHub's, with the awkward parts scanners trip on."""
+    return {
+        "url": "https://api.github.com/repos/o/r/compare/main...dev",
+        "status": "ahead",
+        "ahead_by": total_commits,
+        "total_commits": total_commits,
+        "base_commit": {"sha": "b" * 40, "files": [{"filename": "not-counted"}]},
+        "commits": [{
+            "sha": "c" * 40,
+            "commit": {"message": 'Fix "files": [{}] and total_commits: 99 \\ in text', "tree": {"sha": "t"}},
+            "files": [{"filename": "nested", "patch": "{"}],
+            "parents": [{"sha": "p"}],
+        }],
+        "files": [
+            {
+                "sha": f"{n:040d}",
+                "filename": f"docs/file {n}.md",
+                "status": "modified",
+                "patch": f'@@ -1 +1 @@\n-say "hi"\n+say \\"hi\\" {{{n}}} ]\\\\',
+            }
+            for n in range(files)
+        ],
+    }
+
+
+def scan(body, chunk_size):
+    scanner = CompareScanner()
+    for start in range(0, len(body), chunk_size):
+        scanner.feed(body[start:start + chunk_size])
+    scanner.close()
+    return scanner.total_commits, scanner.files
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("files", [0, 1, 17, 300])
+def test_counts_match_full_parse(files, chunk_size):
+    payload = compare_payload(files)
+    body = json.dumps(payload).encode("utf-8")
+
+    assert scan(body, chunk_size) == (payload["total_commits"], len(payload["files"]))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+def test_compact_body_with_unicode_and_number_at_end(chunk_size):
+    payload = compare_payload(4, total_commits=1234)
+    payload["files"][0]["patch"] = "+ünïcødé ✓ \"quoted\""
+    payload = {key: payload[key] for key in ("files", "commits", "total_commits")}
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    assert body.endswith(b'"total_commits":1234}')
+    assert scan(body, chunk_size) == (1234, 4)
+
+
+def test_truncated_list_gives_same_counts_as_full_mode():
+    payload = compare_payload(300)
+    body = json.dumps(payload).encode("utf-8")
+
+    total_commits, files = scan(body, 64)
+    assert summarize_compare(payload) == (total_commits, files) == (3, 300)
+
+
+def test_reset_forgets_a_partial_body():
+    body = json.dumps(compare_payload(10)).encode("utf-8")
+    scanner = CompareScanner()
+    scanner.feed(body[:len(body) // 2])
+
+    scanner.reset()
+    scanner.feed(body)
+    scanner.close()
+
+    assert (scanner.total_commits, scanner.files) == (3, 10)
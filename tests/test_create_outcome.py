@@ -0,0 +1,19 @@
+import pytest
+
+from auto_create_prs.pulls import create_outcome, pr_error_reason
+from auto_create_prs.retry import RETRY_STATUSES
+
+
+@pytest.mark.parametrize("status_code, outcome", [(201, "created"), (422, "exists")])
+def test_final_statuses(status_code, outcome):
+    assert create_outcome(status_code, 0, 3) == (outcome, None)
+
+
+@pytest.mark.parametrize("status_code", sorted(RETRY_STATUSES))
+def test_server_error_is_retried_then_gives_up(status_code):
+    assert create_outcome(status_code, 0, 3)[0] == "retry"
+    assert create_outcome(status_code, 2, 3) == ("error", "Failed after max retries due to server error.")
+
+
+def test_other_status_is_terminal():
+    assert create_outcome(404, 0, 3) == ("error", pr_error_reason(404))
@@ -0,0 +1,25 @@
+import os
+
+from auto_create_prs import config
+from auto_create_prs.cache import HTTP_CACHE_DIRNAME, HTTP_CACHE_MAX_BYTES, HTTPCache
+
+
+def test_directory_follows_output_dir_set_at_runtime(tmp_path, monkeypatch):
+    cache = HTTPCache(None, HTTP_CACHE_MAX_BYTES)
+    monkeypatch.setattr(config, "BASE_OUTPUT_DIR", str(tmp_path / "elsewhere"))
+
+    cache.store("k", {"ETag": '"v1"'}, [1, 2])
+
+    assert cache.directory == str(tmp_path / "elsewhere" / HTTP_CACHE_DIRNAME)
+    assert os.listdir(cache.directory) == ["k.json"]
+    assert cache.get("k")["value"] == [1, 2]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = HTTPCache(str(tmp_path), 150)
+    for key in "abc":
+        cache.store(key, {"ETag": '"v"'}, "x" * 20)
+
+    assert cache.get("a") is None
+    assert cache.evictions == 1
+    assert sorted(os.listdir(tmp_path)) == ["b.json", "c.json"]
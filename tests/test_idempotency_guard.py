@@ -0,0 +1,36 @@
+import time
+
+from auto_create_prs.pulls import CREATE_CLOCK_SKEW, guarded_result
+from auto_create_prs.results import ResultStatus
+
+
+def github_time(epoch):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(epoch))
+
+
+PR_URL = "https://github.com/org/repo/pull/7"
+
+
+def test_pr_created_by_failed_attempt_is_created():
+    start = time.time()
+    pr = {"html_url": PR_URL, "created_at": github_time(start + 1)}
+
+    assert guarded_result(pr, None, start)[:2] == (ResultStatus.CREATED, PR_URL)
+
+
+def test_pr_older_than_first_attempt_is_duplicate():
+    start = time.time()
+    pr = {"html_url": PR_URL, "created_at": github_time(start - CREATE_CLOCK_SKEW - 3600)}
+
+    assert guarded_result(pr, None, start)[0] == ResultStatus.DUPLICATE
+
+
+def test_pr_indexed_before_first_attempt_is_duplicate():
+    start = time.time()
+    pr = {"html_url": PR_URL, "created_at": github_time(start)}
+
+    assert guarded_result(pr, PR_URL, start)[0] == ResultStatus.DUPLICATE
+
+
+def test_pr_without_creation_time_is_duplicate():
+    assert guarded_result({"html_url": PR_URL}, None, time.time())[0] == ResultStatus.DUPLICATE
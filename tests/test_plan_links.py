@@ -0,0 +1,32 @@
+import pytest
+
+from auto_create_prs.links import canonical_compare, parse_compare_link, plan_links
+
+
+@pytest.mark.parametrize(
+    "link, base, head",
+    [
+        ("https://github.com/Org/Repo/compare/main...fix%2312?expand=1", "main", "fix#12"),
+        ("https://github.com/org/repo/compare/main...100%2525-done", "main", "100%25-done"),
+        ("https://github.com/org/repo/compare/release%20v2...my%20branch", "release v2", "my branch"),
+        ("https://github.com/org/repo/compare/main...feature/a%2Fb", "main", "feature/a/b"),
+    ],
+)
+def test_canonical_link_round_trips(link, base, head):
+    canonical, key = canonical_compare(link)
+
+    assert key[2:] == (base, head)
+    org, repo, parsed_base, parsed_head = parse_compare_link(canonical)
+    assert (org.lower(), repo.lower(), parsed_base, parsed_head) == key
+    assert canonical_compare(canonical) == (canonical, key)
+    assert " " not in canonical and "#" not in canonical
+
+
+def test_plan_links_collapses_encoded_duplicates():
+    planned, report = plan_links([
+        "https://github.com/org/repo/compare/main...fix%2312?expand=1",
+        "https://github.com/ORG/repo/compare/main...fix%2312",
+    ])
+
+    assert planned == ["https://github.com/org/repo/compare/main...fix%2312"]
+    assert report["duplicates"] == 1
@@ -0,0 +1,29 @@
+import threading
+import time
+
+from auto_create_prs import precheck
+from auto_create_prs.ratelimit import rate_limiter
+
+
+def test_probe_admits_one_request_per_worker(monkeypatch):
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def fake_probe(session, link):
+        rate_limiter.acquire()
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        rate_limiter.release(200, {})
+        return [link]
+
+    monkeypatch.setattr(rate_limiter, "max_concurrency", 5)
+    monkeypatch.setattr(precheck, "get_session", lambda: None)
+    monkeypatch.setattr(precheck, "probe_pr", fake_probe)
+
+    links = [f"https://github.com/o/r/pull/{n}" for n in range(precheck.PROBE_WORKERS * 2)]
+    assert precheck.probe_precheck_links(links) == [[link] for link in links]
+    assert in_flight[1] == precheck.PROBE_WORKERS
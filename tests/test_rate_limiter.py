@@ -0,0 +1,27 @@
+import time
+from email.utils import formatdate
+
+import pytest
+
+from auto_create_prs.ratelimit import RateLimitScheduler
+
+
+@pytest.mark.parametrize("retry_after", ["30", formatdate(time.time() + 30, usegmt=True)])
+def test_retry_after_parks_in_seconds_or_http_date(retry_after):
+    scheduler = RateLimitScheduler(5)
+    scheduler.acquire()
+
+    park = scheduler.release(403, {"Retry-After": retry_after}, secondary=True)
+
+    assert 25 < park <= 30
+    assert (scheduler.in_flight, scheduler.parked) == (0, 1)
+
+
+def test_unparseable_retry_after_falls_back_to_secondary_pause():
+    scheduler = RateLimitScheduler(5)
+    scheduler.acquire()
+
+    park = scheduler.release(429, {"Retry-After": "soon"})
+
+    assert park > 50
+    assert scheduler.in_flight == 0
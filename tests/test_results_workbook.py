@@ -0,0 +1,23 @@
+import re
+import zipfile
+
+import openpyxl
+
+from auto_create_prs.results import FILES_TRUNCATED, ResultRow, ResultStatus, write_results_workbook
+
+
+def test_cells_share_style_records(tmp_path):
+    rows = [
+        ResultRow(f"https://github.com/o/r/compare/main...b{n}", ResultStatus.CREATED, None, 1, FILES_TRUNCATED)
+        for n in range(500)
+    ]
+    path = str(tmp_path / "results.xlsx")
+
+    write_results_workbook(rows, path)
+
+    styles = zipfile.ZipFile(path).read("xl/styles.xml").decode("utf-8")
+    assert int(re.search(r'<cellXfs count="(\d+)"', styles).group(1)) <= 3
+    ws = openpyxl.load_workbook(path).active
+    assert (ws["A1"].font.name, ws["A1"].font.b) == ("Segoe UI", True)
+    assert (ws["A501"].font.name, ws["A501"].font.b) == ("Segoe UI", False)
+    assert (ws["C2"].value, ws["E2"].value) == ("-", "300+")
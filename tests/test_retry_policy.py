@@ -0,0 +1,40 @@
+import time
+from email.utils import formatdate
+
+from auto_create_prs.retry import RetryPolicy, retry_after_seconds
+
+
+def exhaust(policy):
+    retried = 0
+    while policy.should_retry(0):
+        retried += 1
+    return retried
+
+
+def test_budget_is_min_plus_ratio_of_requests():
+    policy = RetryPolicy(budget_min=2, budget_ratio=0.5)
+    for _ in range(4):
+        policy.record_request()
+
+    assert exhaust(policy) == 4
+    assert policy.budget_exhausted == 1
+
+
+def test_reset_starts_a_new_budget():
+    policy = RetryPolicy(budget_min=2, budget_ratio=0.5)
+    for _ in range(100):
+        policy.record_request()
+    exhaust(policy)
+
+    policy.reset()
+
+    assert (policy.requests, policy.retries, policy.budget_exhausted) == (0, 0, 0)
+    assert exhaust(policy) == 2
+
+
+def test_retry_after_seconds_parses_both_formats():
+    assert retry_after_seconds("7") == 7.0
+    assert 55 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert retry_after_seconds(formatdate(time.time() - 60, usegmt=True)) == 0.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
@@ -0,0 +1,36 @@
+from auto_create_prs import config
+from auto_create_prs.history import HISTORY_FILENAME, RunHistory, skip_created_today
+from auto_create_prs.links import plan_links
+from auto_create_prs.results import ResultRow, ResultStatus
+
+PR_URL = "https://github.com/Org/Repo/pull/7"
+
+
+def record_created(path, link):
+    history = RunHistory(str(path))
+    history.record_run("run-1", [ResultRow(link, ResultStatus.CREATED, PR_URL)])
+    return history
+
+
+def test_skip_created_today_matches_canonical_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "BASE_OUTPUT_DIR", str(tmp_path))
+    (planned,), _ = plan_links(["https://github.com/Org/Repo/compare/main...fix%2312"])
+    record_created(tmp_path / HISTORY_FILENAME, planned).close()
+
+    rows, remaining = skip_created_today([
+        "https://github.com/org/repo/compare/main...Org:fix%2312?expand=1",
+        "https://github.com/org/repo/compare/main...other",
+    ])
+
+    assert [(row.status, row.pr_link) for row in rows] == [(ResultStatus.DUPLICATE, PR_URL)]
+    assert remaining == ["https://github.com/org/repo/compare/main...other"]
+
+
+def test_query_by_link_matches_encoded_branch(tmp_path):
+    (planned,), _ = plan_links(["https://github.com/Org/Repo/compare/main...100%2525 done"])
+    history = record_created(tmp_path / HISTORY_FILENAME, planned)
+
+    rows = history.query(link="https://github.com/org/REPO/compare/main...100%2525%20done")
+
+    assert [row[2] for row in rows] == [planned]
+    history.close()
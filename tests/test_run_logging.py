@@ -0,0 +1,16 @@
+import json
+import logging
+
+from auto_create_prs.run_log import buffer_run_logging, configure_run_logging, stop_run_logging
+
+
+def test_buffered_records_reach_the_run_log(tmp_path):
+    buffer_run_logging()
+    logging.info("Before the run directory")
+    log_path = tmp_path / "log.jsonl"
+    configure_run_logging(str(log_path))
+    logging.info("After the run directory")
+    stop_run_logging()
+
+    messages = [json.loads(line)["message"] for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert messages == ["Before the run directory", "After the run directory"]
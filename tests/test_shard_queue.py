@@ -0,0 +1,45 @@
+import time
+
+from auto_create_prs import shards
+from auto_create_prs.results import ResultRow, ResultStatus
+from auto_create_prs.shards import ShardQueue
+
+LINK = "https://github.com/org/repo/compare/main...feature"
+PR_URL = "https://github.com/org/repo/pull/7"
+
+
+def test_duplicate_does_not_replace_created(tmp_path):
+    shard_queue = ShardQueue(str(tmp_path / "queue.sqlite3"), "worker-a")
+    shard_queue.append(ResultRow(LINK, ResultStatus.CREATED, PR_URL))
+    shard_queue.append(ResultRow(LINK, ResultStatus.DUPLICATE, PR_URL, reason="Pull request already exists."))
+
+    assert shard_queue.results()[LINK].status == ResultStatus.CREATED
+    shard_queue.close()
+
+
+def test_error_is_replaced(tmp_path):
+    shard_queue = ShardQueue(str(tmp_path / "queue.sqlite3"), "worker-a")
+    shard_queue.append(ResultRow(LINK, ResultStatus.ERROR, reason="Compare request failed: HTTP 502."))
+    shard_queue.append(ResultRow(LINK, ResultStatus.CREATED, PR_URL))
+
+    assert shard_queue.results()[LINK] == ResultRow(LINK, ResultStatus.CREATED, PR_URL)
+    shard_queue.close()
+
+
+def test_heartbeat_keeps_lease_without_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(shards, "SHARD_LEASE_SECONDS", 0.3)
+    monkeypatch.setattr(shards, "SHARD_HEARTBEAT_SECONDS", 0.05)
+    path = str(tmp_path / "queue.sqlite3")
+    owner = ShardQueue(path, "worker-a")
+    owner.fill([LINK], "Title", 1)
+    assert owner.claim() is not None
+    owner.start_heartbeat()
+
+    time.sleep(0.6)
+    other = ShardQueue(path, "worker-b")
+    assert other.claim() is None
+
+    owner.close()
+    time.sleep(0.4)
+    assert other.claim() is not None
+    other.close()
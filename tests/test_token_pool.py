@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from auto_create_prs import config
+from auto_create_prs.tokens import TokenPool
+
+
+def limit_headers(remaining, limit=5000, reset=None):
+    return {
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Reset": str(reset if reset is not None else int(time.time()) + 3600),
+    }
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    def make(*tokens):
+        monkeypatch.setattr(config, "GITHUB_TOKEN", tokens[0])
+        monkeypatch.setattr(config, "GITHUB_TOKENS", list(tokens[1:]))
+        return TokenPool()
+    return make
+
+
+def test_routes_to_token_with_most_headroom(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    assert pool.release(pool.acquire(), 200, limit_headers(100)) is False  # Unknown tokens tie; first wins
+
+    assert pool.acquire() == "token-bbbb"
+    assert pool.acquire() == "token-bbbb"  # Still DEFAULT_TOKEN_BUDGET minus 1 in flight, above 100
+
+
+def test_in_flight_requests_count_against_headroom(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    pool.release(pool.acquire(), 200, limit_headers(10))
+    pool.release(pool.acquire(), 200, limit_headers(11))
+
+    assert [pool.acquire() for _ in range(3)] == ["token-bbbb", "token-aaaa", "token-bbbb"]
+
+
+def test_401_revokes_token_and_resends(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    token = pool.acquire()
+
+    assert pool.release(token, 401, {}) is True
+    assert pool.revoked == ["…aaaa"]
+    assert [pool.acquire() for _ in range(3)] == ["token-bbbb"] * 3
+    assert list(pool.usage()) == ["…bbbb"]
+
+
+def test_last_token_is_never_revoked(make_pool):
+    pool = make_pool("token-aaaa")
+
+    assert pool.release(pool.acquire(), 401, {}) is False
+    assert pool.revoked == []
+    assert pool.acquire() == "token-aaaa"
+
+
+def test_401_on_token_revoked_in_flight_still_resends(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    pool.release(pool.acquire(), 200, limit_headers(4000))
+    pool.release(pool.acquire(), 200, limit_headers(10))
+    in_flight = [pool.acquire() for _ in range(3)]
+    assert in_flight == ["token-aaaa"] * 3
+
+    assert pool.release(in_flight[0], 401, {}) is True
+    assert pool.release(in_flight[1], 401, {}) is True
+    assert pool.release(in_flight[2], 200, {}) is False
+    assert pool.revoked == ["…aaaa"]
+
+
+@pytest.mark.parametrize("status_code", [403, 429])
+def test_primary_limit_switches_to_token_with_budget(make_pool, status_code):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    token = pool.acquire()
+
+    assert pool.release(token, status_code, limit_headers(0)) is True
+    assert pool.acquire() == "token-bbbb"
+
+
+def test_primary_limit_without_other_budget_is_not_resent(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    pool.release(pool.acquire(), 200, limit_headers(1))
+    pool.release(pool.acquire(), 200, limit_headers(0))
+
+    assert pool.release(pool.acquire(), 403, limit_headers(0)) is False
+    assert pool.budget()[0] == 0
+
+
+def test_single_token_primary_limit_is_not_resent(make_pool):
+    pool = make_pool("token-aaaa")
+
+    assert pool.release(pool.acquire(), 403, limit_headers(0)) is False
+
+
+def test_spent_token_is_used_again_after_its_reset(make_pool):
+    pool = make_pool("token-aaaa", "token-bbbb")
+    pool.release(pool.acquire(), 200, limit_headers(0, limit=100, reset=int(time.time()) - 1))
+    pool.release(pool.acquire(), 200, limit_headers(50))
+
+    assert pool.acquire() == "token-aaaa"  # Reset passed: assumed back to its limit of 100
@@ -0,0 +1,19 @@
+from auto_create_prs import cli
+from auto_create_prs.cache import http_cache
+from auto_create_prs.ratelimit import rate_limiter
+
+
+def test_usage_since_reports_only_the_new_traffic(monkeypatch):
+    monkeypatch.setattr(http_cache, "hits", 40)
+    monkeypatch.setattr(http_cache, "misses", 70)
+    monkeypatch.setattr(rate_limiter, "parked", 3)
+    before = cli.usage_snapshot()
+
+    http_cache.hits += 2
+    http_cache.misses += 5
+    rate_limiter.parked += 1
+
+    usage = cli.usage_since(before)
+    assert (usage["cache_hits"], usage["cache_misses"], usage["cache_evictions"]) == (2, 5, 0)
+    assert usage["rate_limit_parks"] == 1
+    assert (usage["connections_opened"], usage["requests_sent"]) == (0, 0)